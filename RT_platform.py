@@ -1,4 +1,4 @@
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.gridspec import GridSpec
@@ -6,6 +6,22 @@ import matplotlib.ticker as mticker
 from mplfinance.original_flavor import candlestick_ohlc
 import datetime
 import math
+import os
+
+from bar_builder import BarBuilder
+from candle_artists import CandleArtists
+from tick_feed import CsvTailReader, WideTickFeed, parse_tick
+
+# 1-minute candles kept in memory; older ones scroll off so each frame costs the same.
+MAX_CANDLES = 500
+# 'blit' draws the chart's artists once and repaints only what changed; 'redraw' rebuilds the axes every frame.
+RENDER_MODE = os.environ.get('RT_PLATFORM_RENDER', 'blit')
+FRAME_INTERVAL_MS = 1
+# Empty candle slots kept to the right so the x-axis is not rescaled on every new candle.
+CANDLE_HEADROOM = 20
+# The scraper's wide CSV with every symbol on one row, feeding the side panels.
+WIDE_CSV = os.environ.get('RT_PLATFORM_WIDE_CSV', f'{datetime.date.today()} stock data.csv')
+SPARKLINE_CANDLES = 60
 
 fig = plt.figure()
 fig.patch.set_facecolor('#121416')
@@ -31,63 +47,155 @@ def figure_design(ax):
     ax.spines['left'].set_color('#808080')
     ax.spines['right'].set_color('#808080')
 
-def string_to_number(df, column):
-    if isinstance(df.iloc[0, df.columns.get_loc(column)], str):
-        df[column] = df[column].str.replace(',', '')
-        df[column] = df[column].astype(float)
-    return df
+class LiveOhlc:
+    """1-minute OHLC candles for one symbol, updated from the rows appended to its tick CSV.
 
+    Each call reads only the new rows and feeds their ticks straight to a BarBuilder,
+    which updates the current candle and its SMAs. The first call backfills the whole
+    file, so no tick is dropped before it reaches a candle.
+    """
 
+    def __init__(self, filename):
+        self.reader = CsvTailReader(filename)
+        self.bars = BarBuilder(interval_seconds=60, sma_windows=(5, 10, 20), capacity=MAX_CANDLES)
+        self.latest = None
 
-def real_data_ohlc(filename, stock_code, usecols):
-    df = pd.read_csv(
-        filename,
-        header=None,
-        usecols=usecols,
-        names=['time', stock_code, 'change', 'volume', 'pattern', 'target'],
-        index_col='time',
-        parse_dates=['time']
-    )
-    
-    # Identify rows with any NaN values
-    index_with_nan = df.index[df.isnull().any(axis=1)]
+    def update(self):
+        for row in self.reader.read_rows():
+            tick = parse_tick(row)
+            if tick is not None:
+                self.bars.add(tick.time, tick.price, tick.volume)
+                self.latest = tick
 
-    # Drop rows with any NaN values
-    df.drop(index_with_nan, axis=0, inplace=True)
+    def frame_data(self):
+        """Candles with 5/10/20-candle SMAs, skipping candles whose average volume fell (bad scrapes)."""
+        bars = self.bars.bars()
+        columns = {
+            'open': bars['open'],
+            'high': bars['high'],
+            'low': bars['low'],
+            'close': bars['close'],
+            'MA5': bars['sma5'],
+            'MA10': bars['sma10'],
+            'MA20': bars['sma20'],
+        }
+        mean_volume = bars['volume'] / np.maximum(bars['ticks'], 1)
+        keep = ~np.isnan(bars['sma20'])
+        keep[1:] &= np.diff(mean_volume) >= 0
+        keep[:1] = False
+        return {name: values[keep] for name, values in columns.items()}
+
+
+live_ohlc = {}
+
+
+def real_data_ohlc(filename, stock_code):
+    """Candles plus the latest price, change, pattern, target and volume for `stock_code`."""
+    live = live_ohlc.get(filename)
+    if live is None:
+        live = live_ohlc[filename] = LiveOhlc(filename)
+    live.update()
+    if live.latest is None:
+        return None
+    latest = live.latest
+    return live.frame_data(), str(latest.price), latest.change, latest.pattern, latest.target, latest.volume
+
+def scaled(values, baseline=None):
+    """Map values into 0..1 (from `baseline` when given) so panels can keep fixed axis limits."""
+    values = np.asarray(values, dtype=float)
+    low = np.nanmin(values) if baseline is None and len(values) else baseline
+    span = np.nanmax(values) - low if len(values) else 0
+    if not span or np.isnan(span):
+        return np.full(len(values), 0.5 if baseline is None else 0.0)
+    return (values - low) / span
+
+
+def change_color(change):
+    return '#18b800' if change >= 0 else '#ff3503'
+
+
+class DashboardPanels:
+    """Side panels fed by the wide CSV: sparklines for Stock[1:] (ax2-ax7), volume of Stock[0] (ax8)
+    and the day's change for every symbol (ax9).
+
+    Artists are created once and only their data changes. Values are scaled into fixed
+    axis limits, so a new tick never forces the axes themselves to be redrawn.
+    """
+
+    def __init__(self, sparkline_axes, volume_ax, change_ax, symbols, animated=True):
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.sparklines = {}
+        self.labels = {}
+        for ax, symbol in zip(sparkline_axes, self.symbols[1:]):
+            self._design(ax, (0, SPARKLINE_CANDLES - 1), (-0.1, 1.3))
+            self.sparklines[symbol], = ax.plot([], [], color='#08a0e9', linewidth=1, animated=animated)
+            self.labels[symbol] = ax.text(0.01, 0.85, symbol, transform=ax.transAxes, color='white', fontsize=10, fontweight='bold', verticalalignment='center', animated=animated)
+
+        self._design(volume_ax, (-1, SPARKLINE_CANDLES), (0, 1.3))
+        self.volume_bars = volume_ax.bar(range(SPARKLINE_CANDLES), np.zeros(SPARKLINE_CANDLES), width=0.8, color='#808080', animated=animated)
+        self.volume_label = volume_ax.text(0.005, 0.85, f'{self.symbols[0]} volume', transform=volume_ax.transAxes, color='white', fontsize=10, fontweight='bold', verticalalignment='center', animated=animated)
+
+        self._design(change_ax, (-0.5, len(self.symbols) - 0.5), (-1.4, 1.4))
+        change_ax.axhline(0, color='#808080', linewidth=0.5)
+        change_ax.set_xticks(range(len(self.symbols)))
+        change_ax.set_xticklabels(self.symbols, fontsize=10)
+        self.change_bars = change_ax.bar(range(len(self.symbols)), np.zeros(len(self.symbols)), width=0.6, animated=animated)
+        self.change_labels = [change_ax.text(x, 0, '', color='white', fontsize=9, horizontalalignment='center', verticalalignment='center', animated=animated) for x in range(len(self.symbols))]
+
+    @staticmethod
+    def _design(ax, xlim, ylim):
+        figure_design(ax)
+        ax.set_xlim(*xlim)
+        ax.set_ylim(*ylim)
+        ax.set_xticks([])
+        ax.set_yticks([])
+
+    @property
+    def artists(self):
+        return list(self.sparklines.values()) + list(self.labels.values()) + list(self.volume_bars) + \
+            [self.volume_label] + list(self.change_bars) + self.change_labels
+
+    def update(self, feed):
+        for symbol, line in self.sparklines.items():
+            closes = feed.bars[symbol].bars()['close'][-SPARKLINE_CANDLES:]
+            line.set_data(np.arange(len(closes)), scaled(closes))
+            quote = feed.latest.get(symbol)
+            if quote is not None:
+                line.set_color(change_color(quote.change))
+                self.labels[symbol].set_text(f'{symbol}  {quote.price:.2f}  {quote.change:+.2f}')
+                self.labels[symbol].set_color(change_color(quote.change))
+
+        volumes = feed.bars[self.symbols[0]].bars()['volume'][-SPARKLINE_CANDLES:]
+        heights = np.zeros(SPARKLINE_CANDLES)
+        heights[:len(volumes)] = scaled(volumes, baseline=0)
+        for bar, height in zip(self.volume_bars, heights):
+            bar.set_height(height)
+        if len(volumes):
+            self.volume_label.set_text(f'{self.symbols[0]} volume  {volumes[-1]:,.0f}')
+
+        percents = np.array([feed.latest[symbol].percent if symbol in feed.latest else np.nan for symbol in self.symbols])
+        largest = np.nanmax(np.abs(percents)) if not np.isnan(percents).all() else 0
+        for bar, label, percent in zip(self.change_bars, self.change_labels, percents):
+            if np.isnan(percent):
+                bar.set_height(0)
+                label.set_text('')
+                continue
+            height = percent / largest if largest else 0
+            bar.set_height(height)
+            bar.set_color(change_color(percent))
+            label.set_text(f'{percent:+.2f}%')
+            label.set_y(height + (0.25 if height >= 0 else -0.25))
 
-    df.index = pd.DatetimeIndex(df.index)
-    
-    df = string_to_number(df, stock_code)
-    df = string_to_number(df, 'volume')
-    df = string_to_number(df, 'target')
-    
-    latest_info = df.iloc[-1, :]
-    latest_price = str(latest_info.iloc[0])
-    latest_change = str(latest_info.iloc[1])
-    
-    df_vol = df['volume'].resample('1Min').mean()
-    data = df[stock_code].resample('1Min').ohlc()
-    data['time'] = data.index
-    data['time']  = pd.to_datetime(data['time'], format='%Y-%m-%d %H:%M:%S')
-    
-    data['MA5'] = data['close'].rolling(5).mean()
-    data['MA10'] = data['close'].rolling(10).mean()
-    data['MA20'] = data['close'].rolling(20).mean()
-    
-    data['volume_diff'] = df_vol.diff()
-    data[data['volume_diff']<0] = None
-    
-    index_with_nan = data.index[data.isnull().any(axis=1)]
-    data.drop(index_with_nan, axis=0, inplace=True)
-    data.reset_index(drop=True, inplace=True)
-    
-    return data, latest_price, latest_change, df['pattern'][-1], df['target'][-1], df['volume'][-1]
 
 def animate(i):
+    if feed.update():
+        panels.update(feed)
     filename = 'stock_data.csv'
-    data, latest_price, latest_change, pattern, target, volume = \
-        real_data_ohlc(filename, Stock[0], [0, 1, 2, 3, 4, 5])
-        
+    frame = real_data_ohlc(filename, Stock[0])
+    if frame is None:
+        return []
+    data, latest_price, latest_change, pattern, target, volume = frame
+
     candle_counter = range(len(data['open'])-1)
     ohlc = []
     for candle in candle_counter:
@@ -131,7 +239,148 @@ def animate(i):
     
     return [ma5, ma10, ma20] + leg.get_texts()
 
-ani = animation.FuncAnimation(fig, animate, interval=1)
+class CandleChart:
+    """The main candle panel, drawn with blitting.
+
+    Candles, SMA lines, legend and header texts are created once. Completed candles,
+    the axes and the legend live in a cached background; each frame restores it and
+    draws only the in-progress candle, the SMA lines and the header values. The
+    background is re-rendered only when a candle completes or the data leaves the
+    axis limits.
+    """
+
+    def __init__(self, ax, stock_code):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        figure_design(ax)
+        ax.grid(True, color='grey', linestyle='-', which='major', axis='both', linewidth=0.3)
+        ax.xaxis.set_major_formatter(mticker.NullFormatter())
+
+        self.candles = CandleArtists(ax, MAX_CANDLES, width=0.4, colorup='#18b800', colordown='#ff3503')
+        self.ma5, = ax.plot([], [], color='pink', linestyle='-', linewidth=1, label='5min SMA', animated=True)
+        self.ma10, = ax.plot([], [], color='orange', linestyle='-', linewidth=1, label='10min SMA', animated=True)
+        self.ma20, = ax.plot([], [], color='#08a0e9', linestyle='-', linewidth=1, label='20min SMA', animated=True)
+        leg = ax.legend(loc='upper left', facecolor='#121416', fontsize=10)
+        for text in leg.get_texts():
+            plt.setp(text, color='w')
+
+        header = dict(transform=ax.transAxes, fontsize=18, fontweight='bold', horizontalalignment='center', verticalalignment='center')
+        ax.text(0.005, 1.05, stock_code, transform=ax.transAxes, color='black', fontsize=18, fontweight='bold', horizontalalignment='left', verticalalignment='center', bbox=dict(facecolor='#FFBF00'))
+        self.price_text = ax.text(0.2, 1.05, '', color='white', animated=True, **header)
+        self.change_text = ax.text(0.4, 1.05, '', color='#18b800', animated=True, **header)
+        self.target_text = ax.text(0.6, 1.05, '', color='#08a0e9', animated=True, **header)
+        self.time_text = ax.text(1.4, 1.05, '', color='white', animated=True, **dict(header, fontsize=12))
+
+        self.lines = [self.ma5, self.ma10, self.ma20]
+        self.texts = [self.price_text, self.change_text, self.target_text, self.time_text]
+        self.overlays = []  # other animated artists on the figure, e.g. the side panels
+        self.live_index = -1
+        self.background = None
+        self.dirty = True  # something changed since the last blit
+        self._header = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def live_candle(self):
+        if self.live_index < 0:
+            return []
+        return [self.candles.wicks[self.live_index], self.candles.bodies[self.live_index]]
+
+    def animated_artists(self):
+        return self.live_candle() + self.lines + self.texts + self.overlays
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        for artist in self.animated_artists():
+            self.ax.figure.draw_artist(artist)
+
+    def _set_live_candle(self, index):
+        """Move the in-progress candle out of the background; the previous one becomes part of it."""
+        for artist in self.live_candle():
+            artist.set_animated(False)
+        self.live_index = index
+        for artist in self.live_candle():
+            artist.set_animated(True)
+
+    def _rescale(self, data):
+        """Refit the axis limits when the data leaves them or occupies a small part of them; True when they changed."""
+        count = len(data['open'])
+        if count == 0:
+            return False
+        values = np.concatenate([data['low'], data['high'], data['MA5'], data['MA10'], data['MA20']])
+        low, high = np.nanmin(values), np.nanmax(values)
+        margin = max((high - low) * 0.1, abs(high) * 0.001, 0.01)
+        bottom, top = self.ax.get_ylim()
+        if bottom <= low and high <= top and top - bottom <= high - low + 8 * margin and count < self.ax.get_xlim()[1]:
+            return False
+        self.ax.set_ylim(low - margin, high + margin)
+        self.ax.set_xlim(-1, count + CANDLE_HEADROOM)
+        return True
+
+    def update(self, data, latest_price, latest_change, target):
+        """Update the artists; True when the background has to be re-rendered."""
+        count = self.candles.count
+        changed = self.candles.update(data['open'], data['high'], data['low'], data['close'])
+        x = np.arange(len(data['open']))
+        self.ma5.set_data(x, data['MA5'])
+        self.ma10.set_data(x, data['MA10'])
+        self.ma20.set_data(x, data['MA20'])
+
+        header = (latest_price, latest_change, target, datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        if header != self._header:
+            self.price_text.set_text(latest_price)
+            self.change_text.set_text(latest_change)
+            self.change_text.set_color('#18b800' if latest_change[0] == '+' else '#ff3503')
+            self.target_text.set_text(target)
+            self.time_text.set_text(header[3])
+            self._header = header
+            self.dirty = True
+        self.dirty |= len(changed) > 0
+
+        live_index = self.candles.count - 1
+        stale = self._rescale(data) or self.candles.count != count or np.any(changed != live_index)
+        if live_index != self.live_index:
+            self._set_live_candle(live_index)
+            stale = True
+        return stale
+
+    def blit(self, stale=False):
+        """Repaint the animated artists if anything changed; `stale` re-renders the background first."""
+        if stale or self.background is None:
+            self.canvas.draw()
+        elif not self.dirty:
+            return
+        self.dirty = False
+        self.canvas.restore_region(self.background)
+        for artist in self.animated_artists():
+            self.ax.figure.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+
+def animate_blit():
+    if feed.update():
+        panels.update(feed)
+        chart.dirty = True
+    stale = False
+    frame = real_data_ohlc('stock_data.csv', Stock[0])
+    if frame is not None:
+        data, latest_price, latest_change, pattern, target, volume = frame
+        stale = chart.update(data, latest_price, latest_change, target)
+    chart.blit(stale)
+
+
+# One read and parse per wide-CSV row, fanned out to every symbol's bars.
+feed = WideTickFeed(WIDE_CSV, Stock, interval_seconds=60, capacity=SPARKLINE_CANDLES)
+panels = DashboardPanels([ax2, ax3, ax4, ax5, ax6, ax7], ax8, ax9, Stock, animated=RENDER_MODE != 'redraw')
+
+if RENDER_MODE == 'redraw':
+    ani = animation.FuncAnimation(fig, animate, interval=FRAME_INTERVAL_MS)
+else:
+    chart = CandleChart(ax1, Stock[0])
+    chart.overlays = panels.artists
+    timer = fig.canvas.new_timer(interval=FRAME_INTERVAL_MS)
+    timer.add_callback(animate_blit)
+    timer.start()
 plt.show()
 
 
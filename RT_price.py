@@ -1,14 +1,26 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
+import hashlib
+import json
 import logging
 import os
-import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 import requests
+from markupsafe import Markup
 
 # Internal modules
-from web_scrapping import summary, event, data as fetch_news
+import http_client
+from chart_render import CHART_DEFAULT_RANGE, CHART_FORMATS, ChartRequestError, get_chart_renderer
+from circuit_breaker import Bulkhead, CircuitBreaker
+from price_history import normalize_ticker
+from quote_refresher import HotSymbolRefresher
+from quote_stream import QuoteBroadcaster
+from shared_cache import get_shared_cache
+from singleflight import SingleFlight
+from ttl_cache import TTLCache
+from web_scrapping import FINNHUB_BASE_URL, summary, event, data as fetch_news
 
 def load_local_market_data_config() -> None:
     """Load local configuration without overriding deployed environment values."""
@@ -34,24 +46,66 @@ load_local_market_data_config()
 PREDICTION_API_URL = os.environ.get("PREDICTION_API_URL")
 PREDICTION_MODE = os.environ.get("PREDICTION_MODE", "remote").lower()
 PREDICTION_TIMEOUT_SECONDS = float(os.environ.get("PREDICTION_TIMEOUT_SECONDS", "15"))
+# Remote predictions only change once a day, so reuse them across requests and workers for
+# this long. Local mode is cached per model version and last daily bar (prediction_cache.py).
+PREDICTION_CACHE_SECONDS = int(os.environ.get("PREDICTION_CACHE_SECONDS", "900"))
+# After PREDICTION_BREAKER_FAILURES consecutive failures or timeouts, remote predictions fail fast
+# for PREDICTION_BREAKER_RESET_SECONDS before one probe request is let through. At most
+# PREDICTION_MAX_CONCURRENCY calls per worker wait on the service; extra ones are refused.
+PREDICTION_BREAKER_FAILURES = int(os.environ.get("PREDICTION_BREAKER_FAILURES", "3"))
+PREDICTION_BREAKER_RESET_SECONDS = float(os.environ.get("PREDICTION_BREAKER_RESET_SECONDS", "30"))
+PREDICTION_MAX_CONCURRENCY = int(
+    os.environ.get("PREDICTION_MAX_CONCURRENCY", max(int(os.environ.get("GUNICORN_THREADS", "4")) // 2, 1))
+)
 TWELVE_DATA_API_KEY = os.environ.get("TWELVE_DATA_API_KEY")
 TWELVE_DATA_QUOTE_URL = "https://api.twelvedata.com/quote"
 QUOTE_CACHE_SECONDS = int(os.environ.get("QUOTE_CACHE_SECONDS", "60"))
-TICKER_RE = re.compile(r"^[A-Z0-9][A-Z0-9.\-^=]{0,14}$")
-quote_cache: dict[str, tuple[float, dict[str, float]]] = {}
-quote_cache_lock = threading.Lock()
+QUOTE_CACHE_MAX_ENTRIES = int(os.environ.get("QUOTE_CACHE_MAX_ENTRIES", "2000"))
+# Stale-while-revalidate: serve quotes up to this many seconds past expiry while refreshing
+# them in the background. 0 disables it, so callers block on the upstream fetch.
+QUOTE_MAX_STALE_SECONDS = int(os.environ.get("QUOTE_MAX_STALE_SECONDS", "0"))
+# Background refresh of the most requested symbols ahead of expiry; 0 credits disables it.
+QUOTE_REFRESH_CREDITS_PER_MINUTE = float(os.environ.get("QUOTE_REFRESH_CREDITS_PER_MINUTE", "0"))
+QUOTE_REFRESH_SYMBOLS = int(os.environ.get("QUOTE_REFRESH_SYMBOLS", "20"))
+QUOTE_REFRESH_LEAD_SECONDS = float(os.environ.get("QUOTE_REFRESH_LEAD_SECONDS", "10"))
+MAX_BATCH_SYMBOLS = int(os.environ.get("MAX_BATCH_SYMBOLS", "50"))
+# /predict/<ticker> looks up profile, metrics and news concurrently and renders whatever
+# finished within the page deadline.
+PAGE_FANOUT_WORKERS = int(os.environ.get("PAGE_FANOUT_WORKERS", "8"))
+PAGE_DEADLINE_SECONDS = float(os.environ.get("PAGE_DEADLINE_SECONDS", "8"))
+# Rendered detail page sections are cached per ticker for their own TTL, and kept for a day
+# after that so an unchanged refetch reuses the old render and a failed one serves it.
+PAGE_FRAGMENT_TTLS = {
+    "overview": int(os.environ.get("FRAGMENT_OVERVIEW_SECONDS", "21600")),
+    "metrics": int(os.environ.get("FRAGMENT_METRICS_SECONDS", "3600")),
+    "news": int(os.environ.get("FRAGMENT_NEWS_SECONDS", "600")),
+}
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get("FRAGMENT_CACHE_MAX_ENTRIES", "1500"))
+# Server-Sent Events: each open stream holds a worker thread under gthread, so cap them per
+# worker and end them periodically (browsers reconnect). Raise the cap with an async worker.
+QUOTE_STREAM_INTERVAL_SECONDS = float(os.environ.get("QUOTE_STREAM_INTERVAL_SECONDS", "5"))
+QUOTE_STREAM_MAX_SECONDS = float(os.environ.get("QUOTE_STREAM_MAX_SECONDS", "300"))
+QUOTE_STREAM_HEARTBEAT_SECONDS = float(os.environ.get("QUOTE_STREAM_HEARTBEAT_SECONDS", "15"))
+QUOTE_STREAM_MAX_CLIENTS = int(
+    os.environ.get("QUOTE_STREAM_MAX_CLIENTS", max(int(os.environ.get("GUNICORN_THREADS", "4")) // 2, 1))
+)
+# Worker warm-up (see gunicorn.conf.py): load the local model, open upstream connections and
+# prefetch quotes for WARMUP_SYMBOLS (comma-separated) before /health reports ready.
+WARMUP_SYMBOLS = [symbol.strip().upper() for symbol in os.environ.get("WARMUP_SYMBOLS", "").split(",") if symbol.strip()]
+# Bounded so that scanning many symbols cannot grow worker memory without limit.
+quote_cache = TTLCache(maxsize=QUOTE_CACHE_MAX_ENTRIES, ttl=QUOTE_CACHE_SECONDS, stale_ttl=QUOTE_MAX_STALE_SECONDS)
+# Coalesces concurrent cache misses so only one upstream fetch per ticker is in flight.
+quote_flight = SingleFlight()
+remote_prediction_cache = TTLCache(QUOTE_CACHE_MAX_ENTRIES, ttl=PREDICTION_CACHE_SECONDS)
+prediction_breaker = CircuitBreaker(
+    "Prediction service", failure_threshold=PREDICTION_BREAKER_FAILURES, reset_timeout=PREDICTION_BREAKER_RESET_SECONDS
+)
+prediction_bulkhead = Bulkhead("the prediction service", limit=PREDICTION_MAX_CONCURRENCY)
 
 logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(asctime)s %(levelname)s %(name)s %(message)s")
 logger = logging.getLogger(__name__)
 
 
-def normalize_ticker(value: object) -> str:
-    ticker = str(value or "").strip().upper()
-    if not TICKER_RE.fullmatch(ticker):
-        raise ValueError("Ticker must be 1-15 valid symbol characters")
-    return ticker
-
-
 def _to_float_list(values):
     """Convert numpy/pandas scalars to plain Python floats for JSON serialization."""
     if values is None:
@@ -65,21 +119,12 @@ def _to_float_list(values):
     return out
 
 
-def get_stock_quote(ticker: str) -> dict[str, float]:
-    """Return a Twelve Data quote, using a short cache to control API consumption."""
-    if not TWELVE_DATA_API_KEY:
-        raise RuntimeError("Market data service is not configured")
-
-    now = time.monotonic()
-    with quote_cache_lock:
-        cached = quote_cache.get(ticker)
-        if cached and cached[0] > now:
-            return cached[1]
-
+def _request_quotes(tickers: list[str]) -> dict[str, object]:
+    """Fetch one or more symbols from Twelve Data in a single request, keyed by symbol."""
     try:
-        response = requests.get(
+        response = http_client.get(
             TWELVE_DATA_QUOTE_URL,
-            params={"symbol": ticker, "apikey": TWELVE_DATA_API_KEY},
+            params={"symbol": ",".join(tickers), "apikey": TWELVE_DATA_API_KEY},
             timeout=10,
         )
         response.raise_for_status()
@@ -89,17 +134,214 @@ def get_stock_quote(ticker: str) -> dict[str, float]:
     except ValueError as exc:
         raise RuntimeError("Market data service returned invalid data") from exc
 
-    if payload.get("status") == "error" or payload.get("code"):
+    if not isinstance(payload, dict):
+        raise RuntimeError("Market data service returned invalid data")
+
+    # Twelve Data only nests the response by symbol when more than one symbol is requested.
+    if len(tickers) == 1:
+        return {tickers[0]: payload}
+    if payload.get("status") == "error":
+        raise RuntimeError("Market data is unavailable for these symbols")
+    return payload
+
+
+def _parse_quote(payload: object) -> dict[str, float]:
+    if not isinstance(payload, dict) or payload.get("status") == "error" or payload.get("code"):
         raise RuntimeError("Market data is unavailable for this symbol")
 
     try:
-        quote = {"currentPrice": float(payload["close"]), "openPrice": float(payload["open"])}
+        return {"currentPrice": float(payload["close"]), "openPrice": float(payload["open"])}
     except (KeyError, TypeError, ValueError) as exc:
         raise RuntimeError("Market data response is incomplete") from exc
 
-    with quote_cache_lock:
-        quote_cache[ticker] = (now + QUOTE_CACHE_SECONDS, quote)
-    return quote
+
+def _fetch_quotes(tickers: list[str]) -> dict[str, object]:
+    """Fetch and cache quotes, mapping each ticker to its quote or the error that prevented it."""
+    payload = _request_quotes(tickers)
+    results: dict[str, object] = {}
+    for ticker in tickers:
+        try:
+            results[ticker] = _parse_quote(payload.get(ticker))
+        except RuntimeError as exc:
+            results[ticker] = exc
+
+    fetched = {ticker: quote for ticker, quote in results.items() if not isinstance(quote, Exception)}
+    for ticker, quote in fetched.items():
+        quote_cache.set(ticker, quote)
+    get_shared_cache().set_many({f"quote:{ticker}": quote for ticker, quote in fetched.items()}, QUOTE_CACHE_SECONDS)
+    return results
+
+
+def _load_quotes(tickers: list[str]) -> dict[str, object]:
+    """Resolve local cache misses from the cross-worker cache first, then from Twelve Data."""
+    results: dict[str, object] = {}
+    for key, (quote, ttl_left) in get_shared_cache().get_many(f"quote:{ticker}" for ticker in tickers).items():
+        ticker = key.partition(":")[2]
+        quote_cache.set(ticker, quote, ttl=ttl_left)
+        results[ticker] = quote
+
+    misses = [ticker for ticker in tickers if ticker not in results]
+    if misses:
+        results.update(_fetch_quotes(misses))
+    return results
+
+
+def _refresh_quotes(tickers: list[str], load=_load_quotes) -> None:
+    for ticker, future in quote_flight.do_many(tickers, load).items():
+        if future.exception() is not None:
+            logger.warning("Background quote refresh failed for %s: %s", ticker, future.exception())
+
+
+def _refresh_quotes_ahead(tickers: list[str]) -> None:
+    """Refresh quotes that are about to expire straight from Twelve Data.
+
+    The shared cache is skipped: its copy expires together with ours, so reading it
+    back would not extend anything and the refresh credit would be wasted.
+    """
+    _refresh_quotes(tickers, load=_fetch_quotes)
+
+
+def _refresh_in_background(tickers: list[str]) -> None:
+    pending = [ticker for ticker in tickers if not quote_flight.in_flight(ticker)]
+    if pending:
+        threading.Thread(target=_refresh_quotes, args=(pending,), name="quote-refresh", daemon=True).start()
+
+
+def _cached_quote(ticker: str):
+    """Return a fresh cached quote, a stale one marked ``"stale": True``, or None."""
+    found = quote_cache.lookup(ticker, allow_stale=QUOTE_MAX_STALE_SECONDS > 0)
+    if found is None:
+        return None
+    quote, is_stale = found
+    return {**quote, "stale": True} if is_stale else quote
+
+
+def get_stock_quote(ticker: str) -> dict[str, float]:
+    """Return a Twelve Data quote, using a short cache to control API consumption."""
+    if not TWELVE_DATA_API_KEY:
+        raise RuntimeError("Market data service is not configured")
+
+    cached = _cached_quote(ticker)
+    if cached is not None:
+        if cached.get("stale"):
+            _refresh_in_background([ticker])
+        return cached
+
+    return quote_flight.do_many([ticker], _load_quotes)[ticker].result()
+
+
+def get_stock_quotes(tickers: list[str]) -> tuple[dict[str, dict[str, float]], dict[str, str]]:
+    """Return quotes for many tickers, fetching every cache miss in one upstream request.
+
+    Returns ``(quotes, errors)`` where ``errors`` maps tickers that could not be
+    resolved to a client-safe message.
+    """
+    if not TWELVE_DATA_API_KEY:
+        raise RuntimeError("Market data service is not configured")
+
+    quotes: dict[str, dict[str, float]] = {}
+    errors: dict[str, str] = {}
+    for ticker in tickers:
+        cached = _cached_quote(ticker)
+        if cached is not None:
+            quotes[ticker] = cached
+
+    stale = [ticker for ticker, quote in quotes.items() if quote.get("stale")]
+    if stale:
+        _refresh_in_background(stale)
+
+    misses = [ticker for ticker in tickers if ticker not in quotes]
+    if not misses:
+        return quotes, errors
+
+    for ticker, future in quote_flight.do_many(misses, _load_quotes).items():
+        exc = future.exception()
+        if exc is None:
+            quotes[ticker] = future.result()
+        else:
+            logger.warning("Quote lookup failed for %s: %s", ticker, exc)
+            errors[ticker] = str(exc) if isinstance(exc, RuntimeError) else "Unable to retrieve stock data"
+    return quotes, errors
+
+
+quote_refresher = HotSymbolRefresher(
+    refresh=_refresh_quotes_ahead,
+    expires_in=quote_cache.expires_in,
+    credits_per_minute=QUOTE_REFRESH_CREDITS_PER_MINUTE,
+    max_symbols=QUOTE_REFRESH_SYMBOLS,
+    lead_seconds=QUOTE_REFRESH_LEAD_SECONDS,
+)
+
+quote_broadcaster = QuoteBroadcaster(fetch=get_stock_quotes, interval=QUOTE_STREAM_INTERVAL_SECONDS)
+page_executor = ThreadPoolExecutor(max_workers=PAGE_FANOUT_WORKERS, thread_name_prefix="page-fanout")
+
+
+fragment_cache = TTLCache(maxsize=FRAGMENT_CACHE_MAX_ENTRIES, ttl=PAGE_FRAGMENT_TTLS["news"], stale_ttl=86400)
+# section -> (fragment template, template variable, placeholder value)
+PAGE_SECTIONS = {
+    "overview": ("fragments/overview.html", "stock_data", None),
+    "metrics": ("fragments/metrics.html", "s", None),
+    "news": ("fragments/news.html", "news", []),
+}
+
+
+def fetch_page_data(ticker: str, sections=tuple(PAGE_SECTIONS)) -> dict[str, object]:
+    """Run the detail page lookups concurrently; sections that fail or miss the deadline are left out."""
+    lookups = {"overview": summary, "metrics": event, "news": fetch_news}
+    futures = {name: page_executor.submit(lookups[name], ticker) for name in sections}
+    done, _pending = wait(futures.values(), timeout=PAGE_DEADLINE_SECONDS)
+
+    results = {}
+    for name, future in futures.items():
+        if future not in done:
+            # Left running: a late result still warms the Finnhub cache for the next view.
+            logger.warning("Page lookup %s for %s missed the %.1fs deadline", name, ticker, PAGE_DEADLINE_SECONDS)
+        elif future.exception() is None:
+            results[name] = future.result()
+    return results
+
+
+def _data_version(data: object) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+# Part of the detail page ETag, so a deploy that changes the templates invalidates browser copies.
+_templates_dir = Path(__file__).with_name("templates")
+PAGE_TEMPLATE_VERSION = _data_version(
+    [path.read_text(encoding="utf-8") for path in [_templates_dir / "new.html", *sorted(_templates_dir.glob("fragments/*.html"))]]
+)
+
+
+def render_page_fragments(ticker: str) -> dict[str, tuple[str, Markup]]:
+    """Return ``(data version, html)`` per detail page section, only refetching expired sections."""
+    fragments = {}
+    expired = {}
+    for section in PAGE_SECTIONS:
+        found = fragment_cache.lookup((section, ticker))
+        if found is not None and not found[1]:
+            fragments[section] = found[0]
+        else:
+            expired[section] = found[0] if found is not None else None
+    if not expired:
+        return fragments
+
+    data = fetch_page_data(ticker, tuple(expired))
+    for section, previous in expired.items():
+        template, variable, placeholder = PAGE_SECTIONS[section]
+        if section not in data:
+            fragments[section] = previous or ("unavailable", Markup(render_template(template, **{variable: placeholder})))
+            continue
+
+        version = _data_version(data[section])
+        if previous is not None and previous[0] == version:
+            fragment = previous
+        else:
+            fragment = (version, Markup(render_template(template, **{variable: data[section]})))
+        # The Yahoo fallbacks report failures as {"error": ...}; show those but do not keep them.
+        if not (isinstance(data[section], dict) and "error" in data[section]):
+            fragment_cache.set((section, ticker), fragment, ttl=PAGE_FRAGMENT_TTLS[section])
+        fragments[section] = fragment
+    return fragments
 
 
 def get_prediction_from_service(ticker: str):
@@ -124,20 +366,104 @@ def get_prediction_from_service(ticker: str):
     if not PREDICTION_API_URL:
         raise RuntimeError("Set PREDICTION_API_URL for the deployed prediction service, or PREDICTION_MODE=local on your computer")
 
+    cached = _cached_remote_predictions([t])
+    if t in cached:
+        return cached[t]
+
+    result = _parse_prediction(_post_prediction({"ticker": t}))
+    _cache_remote_prediction(t, result)
+    return result
+
+
+def get_predictions_from_service(tickers):
+    """Predict several tickers with a single call to the prediction service.
+
+    Sends {"tickers": [...]} and expects {"results": {ticker: prediction}, "errors": {ticker: message}},
+    each prediction in either shape accepted by ``get_prediction_from_service``.
+    Returns ``(results, errors)``; raises RuntimeError when the whole call fails.
+    """
+    tickers = list(dict.fromkeys(normalize_ticker(ticker) for ticker in tickers))
+
+    if PREDICTION_MODE == "local":
+        try:
+            from prediction import make_predictions
+
+            return make_predictions(tickers)
+        except Exception as exc:
+            raise RuntimeError(f"Local prediction failed: {exc}") from exc
+
+    if not PREDICTION_API_URL:
+        raise RuntimeError("Set PREDICTION_API_URL for the deployed prediction service, or PREDICTION_MODE=local on your computer")
+
+    results, errors = _cached_remote_predictions(tickers), {}
+    missing = [t for t in tickers if t not in results]
+    if not missing:
+        return results, errors
+
+    data = _post_prediction({"tickers": missing})
+    if not isinstance(data, dict):
+        raise RuntimeError("Prediction service returned an unexpected batch response")
+    returned = data.get("results") if isinstance(data.get("results"), dict) else {}
+    failed = data.get("errors") if isinstance(data.get("errors"), dict) else {}
+    for t in missing:
+        try:
+            if t not in returned:
+                raise RuntimeError(str(failed.get(t) or "No prediction returned"))
+            results[t] = _parse_prediction(returned[t])
+        except RuntimeError as exc:
+            errors[t] = str(exc)
+            continue
+        _cache_remote_prediction(t, results[t])
+    return results, errors
+
+
+def _cached_remote_predictions(tickers):
+    results = {}
+    for t in tickers:
+        cached = remote_prediction_cache.get(t)
+        if cached is not None:
+            results[t] = cached
+    missing = [t for t in tickers if t not in results]
+    if missing:
+        for key, (value, ttl_left) in get_shared_cache().get_many(f"prediction:{t}" for t in missing).items():
+            t = key.split(":", 1)[1]
+            results[t] = tuple(value)
+            remote_prediction_cache.set(t, results[t], ttl=ttl_left)
+    return results
+
+
+def _cache_remote_prediction(t: str, result) -> None:
+    remote_prediction_cache.set(t, tuple(result))
+    get_shared_cache().set(f"prediction:{t}", list(result), PREDICTION_CACHE_SECONDS)
+
+
+def _post_prediction(payload: dict) -> dict:
+    """POST ``payload`` to the prediction service and return its JSON object body."""
     # Allow passing base URL (auto-append /predict)
     url = PREDICTION_API_URL.rstrip("/")
     if not url.endswith("/predict"):
         url = f"{url}/predict"
 
-    try:
-        resp = requests.post(
-            url,
-            json={"ticker": t},
-            headers={"Content-Type": "application/json", "Accept": "application/json"},
-            timeout=PREDICTION_TIMEOUT_SECONDS,
-        )
-    except requests.RequestException as e:
-        raise RuntimeError(f"Prediction service request failed: {e}")
+    # Fail fast while the service is down, and never let it hold more than its share of threads.
+    with prediction_bulkhead:
+        prediction_breaker.before_call()
+        try:
+            resp = http_client.post(
+                url,
+                json=payload,
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+                timeout=PREDICTION_TIMEOUT_SECONDS,
+            )
+        except requests.RequestException as e:
+            prediction_breaker.record_failure()
+            raise RuntimeError(f"Prediction service request failed: {e}")
+        except BaseException:
+            prediction_breaker.record_failure()
+            raise
+    if resp.status_code >= 500:
+        prediction_breaker.record_failure()
+    else:
+        prediction_breaker.record_success()
 
     if not resp.ok:
         body_preview = (resp.text or "").strip()
@@ -162,6 +488,10 @@ def get_prediction_from_service(ticker: str):
     if isinstance(data, dict) and "error" in data:
         raise RuntimeError(str(data["error"]))
 
+    return data
+
+
+def _parse_prediction(data):
     actual = (data.get("actual_prices") if isinstance(data, dict) else None) or (
         data.get("last_60_actual") if isinstance(data, dict) else None
     )
@@ -181,6 +511,52 @@ def get_prediction_from_service(ticker: str):
     return actual, predicted
 
 
+# --- Worker warm-up ---
+# Set unless a warm-up is running, so the dev server and tests are ready immediately.
+worker_ready = threading.Event()
+worker_ready.set()
+
+
+def warm_up_model() -> None:
+    """Load the local prediction model; safe to run in a preloading gunicorn master before fork."""
+    if PREDICTION_MODE == "local":
+        from prediction import warm_up
+
+        logger.info("Prediction model warmed up: %s", warm_up())
+
+
+def warm_up_worker() -> None:
+    """Load the model, open pooled upstream connections and prefetch the configured quotes."""
+    started = time.monotonic()
+    try:
+        warm_up_model()
+        urls = [TWELVE_DATA_QUOTE_URL, FINNHUB_BASE_URL]
+        if PREDICTION_MODE != "local" and PREDICTION_API_URL:
+            urls.append(PREDICTION_API_URL)
+        http_client.prime(urls)
+        if WARMUP_SYMBOLS:
+            _quotes, errors = get_stock_quotes(WARMUP_SYMBOLS)
+            if errors:
+                logger.warning("Warm-up quote prefetch failed for %s", ", ".join(sorted(errors)))
+    except Exception:
+        # A failed warm-up only costs latency; serve traffic rather than stay unready.
+        logger.exception("Worker warm-up failed")
+    try:
+        # Last and on its own: a broken chart backend must not skip the quote warm-up.
+        get_chart_renderer().pool.warm_up()
+    except Exception:
+        logger.exception("Chart figure warm-up failed")
+    finally:
+        worker_ready.set()
+    logger.info("Worker %s warm in %.2fs", os.getpid(), time.monotonic() - started)
+
+
+def start_warm_up() -> None:
+    """Warm this worker in the background; /health reports "warming" until it finishes."""
+    worker_ready.clear()
+    threading.Thread(target=warm_up_worker, name="worker-warm-up", daemon=True).start()
+
+
 # --- Flask setup ---
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_CONTENT_LENGTH", "16384"))
@@ -223,7 +599,9 @@ def get_stock_data():
         body = request.get_json(silent=True) or {}
         ticker = normalize_ticker(body.get("ticker"))
 
-        return jsonify(get_stock_quote(ticker))
+        quote = get_stock_quote(ticker)
+        quote_refresher.record([ticker])
+        return jsonify(quote)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
     except Exception:
@@ -231,6 +609,71 @@ def get_stock_data():
         return jsonify({"error": "Unable to retrieve stock data"}), 502
 
 
+@app.route("/quotes", methods=["POST"])
+def get_quotes():
+    """Return open/close prices for a list of tickers in a single response."""
+    body = request.get_json(silent=True) or {}
+    symbols = body.get("symbols")
+    if not isinstance(symbols, list) or not symbols:
+        return jsonify({"error": "symbols must be a non-empty list"}), 400
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({"error": f"At most {MAX_BATCH_SYMBOLS} symbols can be requested at once"}), 400
+
+    try:
+        tickers = list(dict.fromkeys(normalize_ticker(symbol) for symbol in symbols))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    try:
+        quotes, errors = get_stock_quotes(tickers)
+    except Exception:
+        logger.exception("Batch stock lookup failed")
+        return jsonify({"error": "Unable to retrieve stock data"}), 502
+
+    quote_refresher.record(quotes)
+    return jsonify({"quotes": quotes, "errors": errors})
+
+
+@app.route("/quotes/stream", methods=["GET"])
+def stream_quotes():
+    """Stream price changes for ``?symbols=AAPL,MSFT`` as Server-Sent Events."""
+    symbols = [symbol for symbol in request.args.get("symbols", "").split(",") if symbol.strip()]
+    if not symbols:
+        return jsonify({"error": "symbols is required"}), 400
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({"error": f"At most {MAX_BATCH_SYMBOLS} symbols can be requested at once"}), 400
+    try:
+        tickers = list(dict.fromkeys(normalize_ticker(symbol) for symbol in symbols))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    if not TWELVE_DATA_API_KEY:
+        return jsonify({"error": "Unable to retrieve stock data"}), 503
+    subscription = quote_broadcaster.subscribe(tickers, max_subscribers=QUOTE_STREAM_MAX_CLIENTS)
+    if subscription is None:
+        return jsonify({"error": "Too many live streams; poll /quotes instead"}), 503
+
+    def events():
+        yield "retry: 5000\n\n"
+        deadline = time.monotonic() + QUOTE_STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            quotes = subscription.get(timeout=QUOTE_STREAM_HEARTBEAT_SECONDS)
+            if quotes:
+                yield f"event: quotes\ndata: {json.dumps({'quotes': quotes})}\n\n"
+            else:
+                yield ": keep-alive\n\n"
+
+    response = Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # The server closes the response however the stream ends, including before the first
+    # chunk is sent, which a ``finally`` in the generator would miss.
+    response.call_on_close(lambda: quote_broadcaster.unsubscribe(subscription))
+    return response
+
+
 # Browser-friendly page: always HTML
 @app.route("/predict/<ticker>", methods=["GET"])
 def predict_ticker(ticker):
@@ -259,37 +702,28 @@ def predict_ticker(ticker):
             400,
         )
 
-    stock_data = None
-    event_data = None
-    news_data = []
-
-    try:
-        stock_data = summary(ticker)
-    except Exception:
-        stock_data = None
-
-    try:
-        event_data = event(ticker)
-    except Exception:
-        event_data = None
-
-    try:
-        news_data = fetch_news(ticker)
-    except Exception:
-        news_data = []
-
-    return render_template(
-        "new.html",
-        stock_data=stock_data,
-        news=news_data,
-        next_day_prediction=None,
-        s=event_data,
-        predictions=[],
-        plot_data=None,
-        ticker=ticker,
-        predict_api_url=predict_api_url,
-        predict_error=None,
-    )
+    fragments = render_page_fragments(ticker)
+    etag = _data_version([PAGE_TEMPLATE_VERSION, ticker, *(fragments[section][0] for section in PAGE_SECTIONS)])
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = app.make_response(
+            render_template(
+                "new.html",
+                overview_html=fragments["overview"][1],
+                metrics_html=fragments["metrics"][1],
+                news_html=fragments["news"][1],
+                next_day_prediction=None,
+                predictions=[],
+                plot_data=None,
+                ticker=ticker,
+                predict_api_url=predict_api_url,
+                predict_error=None,
+            )
+        )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 # JSON endpoint consumed by app.js (same-origin). It calls API Gateway server-side.
@@ -321,8 +755,64 @@ def predict():
         return jsonify({"error": "Prediction service is temporarily unavailable"}), 502
 
 
+@app.route("/predictions", methods=["POST"])
+def predict_many():
+    """Predict a list of tickers with one call to the prediction service."""
+    body = request.get_json(silent=True) or {}
+    symbols = body.get("tickers")
+    if not isinstance(symbols, list) or not symbols:
+        return jsonify({"error": "tickers must be a non-empty list"}), 400
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({"error": f"At most {MAX_BATCH_SYMBOLS} tickers can be requested at once"}), 400
+
+    try:
+        tickers = list(dict.fromkeys(normalize_ticker(symbol) for symbol in symbols))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    try:
+        results, errors = get_predictions_from_service(tickers)
+    except Exception:
+        logger.exception("Batch prediction request failed")
+        return jsonify({"error": "Prediction service is temporarily unavailable"}), 502
+
+    payload = {}
+    for ticker, (actual_prices, predicted_prices) in results.items():
+        predicted_prices = _to_float_list(predicted_prices)
+        payload[ticker] = {
+            "actual_prices": _to_float_list(actual_prices),
+            "predicted_prices": predicted_prices,
+            "predicted_next_close": predicted_prices[0] if predicted_prices else None,
+        }
+    return jsonify({"results": payload, "errors": errors})
+
+
+@app.route("/chart/<ticker>.<any(png, svg):fmt>", methods=["GET"])
+def chart_image(ticker, fmt):
+    """Candlestick + SMA chart image, e.g. ``/chart/AAPL.png?range=1y``, for emails and reports."""
+    try:
+        ticker = normalize_ticker(ticker)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    try:
+        image = get_chart_renderer().render(ticker, request.args.get("range", CHART_DEFAULT_RANGE), fmt)
+    except ChartRequestError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        logger.exception("Chart rendering failed", extra={"ticker": ticker})
+        return jsonify({"error": "Chart rendering failed"}), 500
+
+    response = Response(image, mimetype=CHART_FORMATS[fmt])
+    response.set_etag(hashlib.sha1(image).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
+
 @app.route("/health")
 def health():
+    if not worker_ready.is_set():
+        return jsonify({"status": "warming"}), 503
     return jsonify({"status": "ok"}), 200
 
 
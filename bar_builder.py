@@ -0,0 +1,117 @@
+"""Streaming OHLCV bars with running simple moving averages, built one tick at a time.
+
+Shared by the live chart (RT_platform.py) and anything server-side that needs
+intraday bars, without pandas on the per-tick path.
+"""
+from collections import deque
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+def bar_dtype(sma_windows: Iterable[int]) -> np.dtype:
+    return np.dtype(
+        [
+            ("time", "datetime64[ms]"),
+            ("open", "f8"),
+            ("high", "f8"),
+            ("low", "f8"),
+            ("close", "f8"),
+            ("volume", "f8"),
+            ("ticks", "i8"),
+        ]
+        + [(f"sma{window}", "f8") for window in sma_windows]
+    )
+
+
+class _RunningSum:
+    """Sum of the last ``window`` completed closes, updated in O(1) per bar."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.total = 0.0
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def mean_with(self, value: float) -> float:
+        """SMA over the last ``window - 1`` completed closes plus ``value``; NaN until there are enough."""
+        if len(self.values) < self.window - 1:
+            return float("nan")
+        previous = self.total - self.values[0] if len(self.values) == self.window else self.total
+        return (previous + value) / self.window
+
+
+class BarBuilder:
+    """Aggregate ticks into fixed-interval bars.
+
+    The in-progress bar is updated in place; when a tick opens a new interval the
+    previous bar is completed, its SMAs are fixed and it is stored in a ring of the
+    last ``capacity`` bars. Every tick costs O(1) regardless of session length.
+    """
+
+    def __init__(self, interval_seconds: float = 60, sma_windows: Iterable[int] = (5, 10, 20), capacity: int = 500):
+        self.interval = np.timedelta64(int(interval_seconds * 1000), "ms")
+        self.sma_windows = tuple(sma_windows)
+        self.dtype = bar_dtype(self.sma_windows)
+        self.capacity = capacity
+        self._bars = np.zeros(capacity, dtype=self.dtype)
+        self._sums = [_RunningSum(window) for window in self.sma_windows]
+        self._current = None  # [start, open, high, low, close, volume, ticks]
+        self.total = 0  # bars ever completed
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def add(self, time, price: float, volume: float = 0.0) -> bool:
+        """Add one tick; returns True when it completed the previous bar."""
+        time = np.datetime64(time, "ms")
+        start = time - (time - np.datetime64(0, "ms")) % self.interval
+        current = self._current
+        # Late ticks are folded into the current bar rather than reopening a finished one.
+        if current is not None and start <= current[0]:
+            current[2] = max(current[2], price)
+            current[3] = min(current[3], price)
+            current[4] = price
+            current[5] += volume
+            current[6] += 1
+            return False
+
+        completed = current is not None
+        if completed:
+            self._complete(current)
+        self._current = [start, price, price, price, price, volume, 1]
+        return completed
+
+    def add_many(self, times, prices, volumes) -> int:
+        """Add ticks in order; returns how many bars were completed."""
+        return sum(self.add(time, price, volume) for time, price, volume in zip(times, prices, volumes))
+
+    def _complete(self, bar: list) -> None:
+        smas = [running.mean_with(bar[4]) for running in self._sums]
+        for running in self._sums:
+            running.push(bar[4])
+        self._bars[self.total % self.capacity] = (*bar, *smas)
+        self.total += 1
+
+    @property
+    def current(self) -> Optional[np.ndarray]:
+        """The in-progress bar as a one-element record array, SMAs including its latest close."""
+        if self._current is None:
+            return None
+        smas = [running.mean_with(self._current[4]) for running in self._sums]
+        return np.array([(*self._current, *smas)], dtype=self.dtype)
+
+    def completed(self) -> np.ndarray:
+        """Completed bars still held, oldest first."""
+        slots = np.arange(self.total - len(self), self.total) % self.capacity
+        return self._bars[slots]
+
+    def bars(self, include_current: bool = True) -> np.ndarray:
+        current = self.current if include_current else None
+        completed = self.completed()
+        return completed if current is None else np.concatenate([completed, current])
@@ -0,0 +1,64 @@
+"""Candlestick artists that are created once and updated in place.
+
+``candlestick_ohlc`` builds new patches for every candle on every call. CandleArtists
+keeps a fixed pool of body/wick artists on an Axes and only touches the candles
+whose values changed, which makes it suitable for blitted animation and for
+re-rendering pooled figures.
+"""
+from typing import Sequence
+
+import numpy as np
+from matplotlib.lines import Line2D
+from matplotlib.patches import Rectangle
+
+
+class CandleArtists:
+    def __init__(
+        self, ax, capacity: int, width: float = 0.4, colorup: str = '#18b800', colordown: str = '#ff3503',
+        animated: bool = False,
+    ):
+        self.ax = ax
+        self.capacity = capacity
+        self.width = width
+        self.colorup = colorup
+        self.colordown = colordown
+        self.bodies = []
+        self.wicks = []
+        for x in range(capacity):
+            wick = Line2D([x, x], [0, 0], linewidth=0.5, visible=False, animated=animated)
+            body = Rectangle((x - width / 2, 0), width, 0, linewidth=0.5, visible=False, animated=animated)
+            ax.add_line(wick)
+            ax.add_patch(body)
+            self.wicks.append(wick)
+            self.bodies.append(body)
+        self._values = np.full((capacity, 4), np.nan)
+        self.count = 0
+
+    @property
+    def artists(self) -> list:
+        """Visible artists, wicks first so bodies are drawn over them."""
+        return self.wicks[:self.count] + self.bodies[:self.count]
+
+    def update(self, open_: Sequence[float], high: Sequence[float], low: Sequence[float], close: Sequence[float]) -> np.ndarray:
+        """Show the last `capacity` candles; returns the indices whose artists changed."""
+        values = np.column_stack([open_, high, low, close])[-self.capacity:]
+        count = len(values)
+        changed = np.flatnonzero(np.any(values != self._values[:count], axis=1))
+        for i in changed:
+            o, h, l, c = values[i]
+            color = self.colorup if c >= o else self.colordown
+            self.wicks[i].set_data([i, i], [l, h])
+            self.wicks[i].set_color(color)
+            self.wicks[i].set_visible(True)
+            self.bodies[i].set_y(min(o, c))
+            self.bodies[i].set_height(abs(c - o))
+            self.bodies[i].set_facecolor(color)
+            self.bodies[i].set_edgecolor(color)
+            self.bodies[i].set_visible(True)
+        for i in range(count, self.count):
+            self.wicks[i].set_visible(False)
+            self.bodies[i].set_visible(False)
+        self._values[:count] = values
+        self._values[count:] = np.nan
+        self.count = count
+        return changed
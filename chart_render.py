@@ -0,0 +1,235 @@
+"""Headless candlestick + SMA charts (PNG/SVG) rendered from the price-history store.
+
+Charts are drawn with the Agg canvas on a small pool of figures that are built once and
+reused: rendering only updates the candle and SMA artists' data. Finished images are
+cached by (ticker, range, last bar, format), so a chart is redrawn only when a new bar
+arrives or the price-history refresh window passes.
+"""
+import io
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+import numpy as np
+
+from price_history import PRICE_HISTORY_REFRESH_SECONDS, get_price_history_store, period_days
+from singleflight import SingleFlight
+from ttl_cache import TTLCache
+
+CHART_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+# History kept in the store (shared with the prediction model); longer ranges are refused.
+CHART_HISTORY_PERIOD = "5y"
+CHART_DEFAULT_RANGE = os.environ.get("CHART_DEFAULT_RANGE", "6mo")
+CHART_SMA_WINDOWS = tuple(int(window) for window in os.environ.get("CHART_SMA_WINDOWS", "20,50").split(",") if window.strip())
+CHART_WIDTH_PX = int(os.environ.get("CHART_WIDTH_PX", "800"))
+CHART_HEIGHT_PX = int(os.environ.get("CHART_HEIGHT_PX", "400"))
+CHART_DPI = 100
+# Longer ranges are drawn with each candle covering several days.
+CHART_MAX_CANDLES = int(os.environ.get("CHART_MAX_CANDLES", "260"))
+# Figures per process; renders beyond this wait up to CHART_POOL_WAIT_SECONDS for a free one.
+CHART_POOL_SIZE = int(os.environ.get("CHART_POOL_SIZE", "2"))
+CHART_POOL_WAIT_SECONDS = float(os.environ.get("CHART_POOL_WAIT_SECONDS", "10"))
+CHART_CACHE_MAX_ENTRIES = int(os.environ.get("CHART_CACHE_MAX_ENTRIES", "256"))
+CHART_CACHE_MAX_BYTES = int(os.environ.get("CHART_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+SMA_COLORS = ("orange", "#08a0e9", "pink")
+
+
+class ChartRequestError(ValueError):
+    """The requested chart cannot be drawn: unknown format, bad range or no bars in it."""
+
+
+def moving_averages(closes: np.ndarray, windows) -> dict[int, np.ndarray]:
+    """Simple moving averages of ``closes`` per window, NaN until a full window is available."""
+    closes = np.asarray(closes, dtype=np.float64)
+    sums = np.concatenate([[0.0], np.cumsum(closes)])
+    averages = {}
+    for window in windows:
+        average = np.full(len(closes), np.nan)
+        if len(closes) >= window:
+            average[window - 1:] = (sums[window:] - sums[:-window]) / window
+        averages[window] = average
+    return averages
+
+
+def group_bars(columns: dict[str, np.ndarray], max_candles: int) -> dict[str, np.ndarray]:
+    """Merge runs of consecutive bars so at most ``max_candles`` remain; each keeps its last bar's date and SMAs."""
+    rows = len(columns["close"])
+    size = -(-rows // max_candles) if max_candles > 0 else 1
+    if size <= 1:
+        return columns
+    starts = np.arange(0, rows, size)
+    ends = np.minimum(starts + size, rows) - 1
+    grouped = {name: values[ends] for name, values in columns.items()}
+    grouped["open"] = columns["open"][starts]
+    grouped["high"] = np.maximum.reduceat(columns["high"], starts)
+    grouped["low"] = np.minimum.reduceat(columns["low"], starts)
+    return grouped
+
+
+class ChartFigure:
+    """One reusable figure: candle, SMA, legend and title artists are created once."""
+
+    def __init__(self, sma_windows=CHART_SMA_WINDOWS, max_candles: int = CHART_MAX_CANDLES,
+                 width_px: int = CHART_WIDTH_PX, height_px: int = CHART_HEIGHT_PX, dpi: int = CHART_DPI):
+        # Imported on first use so that importing this module stays cheap.
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        from candle_artists import CandleArtists
+
+        self.figure = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi, facecolor="#121416")
+        FigureCanvasAgg(self.figure)
+        ax = self.ax = self.figure.add_subplot()
+        ax.set_facecolor("#091217")
+        ax.tick_params(axis="both", labelsize=9, colors="white")
+        for spine in ax.spines.values():
+            spine.set_color("#808080")
+        ax.grid(True, color="grey", linestyle="-", which="major", axis="both", linewidth=0.3)
+
+        self.sma_windows = tuple(sma_windows)
+        self.candles = CandleArtists(ax, max_candles, width=0.6)
+        self.sma_lines = [
+            ax.plot([], [], color=SMA_COLORS[i % len(SMA_COLORS)], linewidth=1, label=f"{window}-day SMA")[0]
+            for i, window in enumerate(self.sma_windows)
+        ]
+        if self.sma_lines:
+            legend = ax.legend(loc="upper left", facecolor="#121416", fontsize=8)
+            for text in legend.get_texts():
+                text.set_color("white")
+        self.title = ax.set_title("", color="white", fontsize=11, fontweight="bold", loc="left")
+
+    def render(self, title: str, bars: dict[str, np.ndarray], fmt: str = "png") -> bytes:
+        """Draw ``bars`` (date/open/high/low/close columns plus ``sma<N>`` columns) and return the encoded image."""
+        count = len(bars["close"])
+        self.candles.update(bars["open"], bars["high"], bars["low"], bars["close"])
+        x = np.arange(count)
+        for window, line in zip(self.sma_windows, self.sma_lines):
+            line.set_data(x, bars[f"sma{window}"])
+        self.title.set_text(title)
+
+        values = np.concatenate([bars["low"], bars["high"], *(bars[f"sma{window}"] for window in self.sma_windows)])
+        low, high = np.nanmin(values), np.nanmax(values)
+        margin = max((high - low) * 0.05, abs(high) * 0.001, 0.01)
+        self.ax.set_ylim(low - margin, high + margin)
+        self.ax.set_xlim(-1, max(count, 1))
+        ticks = np.unique(np.linspace(0, count - 1, min(count, 6)).astype(int))
+        self.ax.set_xticks(ticks)
+        self.ax.set_xticklabels(np.datetime_as_string(bars["date"][ticks].astype("datetime64[D]")))
+
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format=fmt, facecolor=self.figure.get_facecolor())
+        return buffer.getvalue()
+
+
+class FigurePool:
+    """Up to ``size`` figures built on demand and handed out to one render at a time."""
+
+    def __init__(self, factory: Callable[[], ChartFigure] = ChartFigure, size: int = CHART_POOL_SIZE,
+                 wait: float = CHART_POOL_WAIT_SECONDS):
+        self.factory = factory
+        self.size = max(1, size)
+        self.wait = wait
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _build(self) -> ChartFigure:
+        try:
+            return self.factory()
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def warm_up(self) -> None:
+        """Build the remaining figures ahead of the first requests."""
+        while self._reserve():
+            self._idle.put(self._build())
+
+    @contextmanager
+    def figure(self):
+        try:
+            chart = self._idle.get_nowait()
+        except queue.Empty:
+            if self._reserve():
+                chart = self._build()
+            else:
+                try:
+                    chart = self._idle.get(timeout=self.wait)
+                except queue.Empty:
+                    raise RuntimeError("All chart figures are busy") from None
+        try:
+            yield chart
+        finally:
+            self._idle.put(chart)
+
+
+class ChartRenderer:
+    """Cached, pooled chart rendering; concurrent requests for the same chart render it once."""
+
+    def __init__(self, store=None, pool: Optional[FigurePool] = None, sma_windows=CHART_SMA_WINDOWS,
+                 max_candles: int = CHART_MAX_CANDLES, cache_ttl: float = PRICE_HISTORY_REFRESH_SECONDS):
+        self.store = store
+        self.sma_windows = tuple(sma_windows)
+        self.max_candles = max_candles
+        self.pool = pool or FigurePool(lambda: ChartFigure(self.sma_windows, max_candles))
+        self.cache = TTLCache(CHART_CACHE_MAX_ENTRIES, ttl=cache_ttl, max_bytes=CHART_CACHE_MAX_BYTES)
+        self._flight = SingleFlight()
+
+    def render(self, ticker: str, chart_range: str = CHART_DEFAULT_RANGE, fmt: str = "png") -> bytes:
+        """Chart of the last ``chart_range`` (e.g. ``6mo``, ``1y``) of daily bars for ``ticker``."""
+        if fmt not in CHART_FORMATS:
+            raise ChartRequestError(f"Chart format must be one of: {', '.join(CHART_FORMATS)}")
+        try:
+            days = period_days(chart_range)
+        except ValueError as exc:
+            raise ChartRequestError(str(exc)) from None
+        if days <= 0:
+            raise ChartRequestError("Chart range must cover at least one day")
+        if days > period_days(CHART_HISTORY_PERIOD):
+            raise ChartRequestError(f"Chart range can be at most {CHART_HISTORY_PERIOD}")
+
+        history = (self.store or get_price_history_store()).update(ticker, period=CHART_HISTORY_PERIOD)
+        if not len(history["date"]):
+            raise ChartRequestError(f"No price history for {ticker}")
+        key = (ticker, chart_range, int(history["date"][-1]), fmt)
+        image = self.cache.get(key)
+        if image is None:
+            image = self._flight.do(key, lambda: self._render(ticker, chart_range, days, history, fmt))
+            self.cache.set(key, image)
+        return image
+
+    def _render(self, ticker: str, chart_range: str, days: int, history: dict[str, np.ndarray], fmt: str) -> bytes:
+        dates = history["date"]
+        start = int(np.searchsorted(dates, dates[-1] - days, side="right"))
+        # SMAs are computed over the lookback before the range so the lines start at its left edge.
+        lookback = max(0, start - max(self.sma_windows, default=0) + 1)
+        averages = moving_averages(history["close"][lookback:], self.sma_windows)
+        bars = {name: np.asarray(history[name][start:]) for name in ("date", "open", "high", "low", "close")}
+        for window, average in averages.items():
+            bars[f"sma{window}"] = average[start - lookback:]
+        bars = group_bars(bars, self.max_candles)
+        with self.pool.figure() as chart:
+            return chart.render(f"{ticker}  {chart_range}", bars, fmt)
+
+
+_renderer: Optional[ChartRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ChartRenderer()
+        return _renderer
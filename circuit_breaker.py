@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Optional
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling an upstream after repeated failures, then probe it before trusting it again.
+
+    closed:    calls go through; ``failure_threshold`` consecutive failures open the circuit.
+    open:      calls fail fast with CircuitOpenError for ``reset_timeout`` seconds.
+    half-open: one probe call is let through; success closes the circuit, failure reopens it.
+
+    Every call allowed by ``before_call`` must be followed by ``record_success`` or ``record_failure``.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_in = max(self.reset_timeout - (now - self._opened_at), 0.0)
+        raise CircuitOpenError(f"{self.name} is unavailable; retrying in {retry_in:.0f}s")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class Bulkhead:
+    """Cap concurrent calls to one upstream so a slow dependency cannot take every worker thread."""
+
+    def __init__(self, name: str, limit: int, wait: float = 0.0):
+        self.name = name
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(max(1, limit))
+
+    def __enter__(self):
+        acquired = self._slots.acquire(timeout=self.wait) if self.wait > 0 else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise RuntimeError(f"Too many concurrent calls to {self.name}")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._slots.release()
@@ -0,0 +1,113 @@
+"""Single-file columnar tables that load as zero-copy, memory-mapped NumPy views.
+
+Layout (little-endian):
+
+    bytes 0-7    magic ``STKCOL\\x00\\x01``
+    bytes 8-11   uint32 length of the JSON header
+    header       {"rows": n, "columns": {name: {"dtype": "<f4", "offset": o}}, "meta": {...}}
+    data         each column stored contiguously at its 64-byte aligned offset
+
+Convert the bundled yfinance CSVs with ``python columnar.py SHOP_data.csv APLE_data.csv``.
+"""
+import csv
+import json
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+MAGIC = b"STKCOL\x00\x01"
+ALIGNMENT = 64
+OHLCV_DTYPES = {"date": "<i8", "open": "<f4", "high": "<f4", "low": "<f4", "close": "<f4", "volume": "<i8"}
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_table(path, columns: dict[str, np.ndarray], meta: Optional[dict] = None) -> None:
+    """Atomically write equal-length 1-D ``columns`` (and a small JSON ``meta``) to ``path``."""
+    path = Path(path)
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+    rows = lengths.pop() if lengths else 0
+    arrays = {name: np.ascontiguousarray(column, dtype=np.dtype(column.dtype).newbyteorder("<")) for name, column in columns.items()}
+
+    # Offsets live in the header, so grow the reserved header space until the header fits.
+    data_start = ALIGNMENT
+    while True:
+        layout, offset = {}, data_start
+        for name, array in arrays.items():
+            layout[name] = {"dtype": array.dtype.str, "offset": offset}
+            offset = _align(offset + array.nbytes)
+        header = json.dumps({"rows": rows, "columns": layout, "meta": meta or {}}).encode("utf-8")
+        if 12 + len(header) <= data_start:
+            break
+        data_start = _align(12 + len(header))
+    header = header.ljust(data_start - 12)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as handle:
+        handle.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for name, array in arrays.items():
+            handle.seek(layout[name]["offset"])
+            handle.write(array.tobytes())
+    os.replace(tmp, path)
+
+
+def read_header(path) -> dict:
+    with open(path, "rb") as handle:
+        prefix = handle.read(12)
+        if len(prefix) < 12 or prefix[:8] != MAGIC:
+            raise ValueError(f"{path} is not a columnar table")
+        (length,) = struct.unpack("<I", prefix[8:])
+        return json.loads(handle.read(length))
+
+
+def open_table(path) -> tuple[dict[str, np.ndarray], dict]:
+    """Return ``(columns, meta)`` where every column is a read-only view into one file mapping."""
+    header = read_header(path)
+    rows = header["rows"]
+    if rows == 0:
+        return {name: np.empty(0, dtype=spec["dtype"]) for name, spec in header["columns"].items()}, header["meta"]
+    mapped = np.memmap(path, mode="r", dtype=np.uint8)
+    columns = {}
+    for name, spec in header["columns"].items():
+        dtype = np.dtype(spec["dtype"])
+        columns[name] = mapped[spec["offset"]: spec["offset"] + rows * dtype.itemsize].view(dtype)
+    return columns, header["meta"]
+
+
+def convert_yfinance_csv(csv_path, out_path=None) -> Path:
+    """Convert a yfinance CSV with the three-row ``Price/Ticker/Date`` header into an OHLCV table."""
+    csv_path = Path(csv_path)
+    with open(csv_path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        fields = [field.strip().lower() for field in next(reader)]
+        tickers = next(reader)
+        next(reader)  # "Date,,,,," row
+        close = fields.index("close")
+        rows = [row for row in reader if row and row[0] and row[close]]
+
+    ticker = next((value for value in tickers[1:] if value), csv_path.stem.split("_")[0]).upper()
+    columns = {"date": np.array([row[0][:10] for row in rows], dtype="datetime64[D]").astype(np.int64)}
+    for name in ("open", "high", "low", "close", "volume"):
+        index = fields.index(name)
+        missing = "0" if name == "volume" else "nan"
+        values = np.array([row[index] or missing for row in rows], dtype=np.float64)
+        columns[name] = values.astype(OHLCV_DTYPES[name])
+
+    out_path = Path(out_path) if out_path else csv_path.with_name(f"{ticker}.ohlcv")
+    write_table(out_path, columns, meta={"ticker": ticker, "source": csv_path.name})
+    return out_path
+
+
+if __name__ == "__main__":
+    for argument in sys.argv[1:]:
+        print(convert_yfinance_csv(argument))
@@ -3,10 +3,32 @@ import os
 bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
 workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
 threads = int(os.environ.get("GUNICORN_THREADS", "4"))
-worker_class = "gthread"
+# gthread serves each live quote stream (/quotes/stream) from one of `threads`; set
+# GUNICORN_WORKER_CLASS=gevent (pip install gevent) to hold many streams per worker.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
 timeout = int(os.environ.get("GUNICORN_TIMEOUT", "45"))
 graceful_timeout = 30
 keepalive = 5
 accesslog = "-"
 errorlog = "-"
 capture_output = True
+# Import the app once in the master and fork workers from it (shares the loaded model pages
+# copy-on-write). Background threads and pooled connections are recreated in each worker.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "false").lower() in ("1", "true", "yes")
+
+
+def when_ready(server):
+    if preload_app:
+        from RT_price import warm_up_model
+
+        # TensorFlow does not survive fork; the NumPy engine (the default) does.
+        if os.environ.get("PREDICTION_ENGINE", "numpy").lower() != "keras":
+            warm_up_model()
+
+
+def post_worker_init(worker):
+    # Runs in each worker after the app is loaded; /health answers 503 until warm.
+    from RT_price import start_warm_up
+
+    start_warm_up()
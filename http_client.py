@@ -0,0 +1,108 @@
+import logging
+import os
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+# Shared keep-alive sessions, one per upstream host, so repeat calls skip the TCP/TLS handshake.
+#   HTTP_POOL_SIZES="api.twelvedata.com=20,finnhub.io=10" overrides HTTP_POOL_MAXSIZE per host.
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("HTTP_CONNECT_TIMEOUT_SECONDS", "3.05"))
+HTTP_READ_TIMEOUT_SECONDS = float(os.environ.get("HTTP_READ_TIMEOUT_SECONDS", "10"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "10"))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+HTTP_RETRY_BACKOFF_SECONDS = float(os.environ.get("HTTP_RETRY_BACKOFF_SECONDS", "0.3"))
+
+
+def _parse_pool_sizes(value: str) -> dict[str, int]:
+    sizes = {}
+    for item in value.split(","):
+        host, separator, size = item.partition("=")
+        if separator and host.strip() and size.strip().isdigit():
+            sizes[host.strip().lower()] = int(size)
+    return sizes
+
+
+HTTP_POOL_SIZES = _parse_pool_sizes(os.environ.get("HTTP_POOL_SIZES", ""))
+
+logger = logging.getLogger(__name__)
+
+
+class _Retry(Retry):
+    """Retry that gives up at once on a read timeout but still retries other read errors."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        # Each retried read timeout waits out the full read timeout again, so a stalled upstream
+        # would hold the worker for several timeouts. Other read errors (a reset or closed
+        # keep-alive socket) fail fast and are what pooled connections hit, so those are retried.
+        if isinstance(error, ReadTimeoutError):
+            raise error
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_pid: Optional[int] = None
+_sessions_lock = threading.Lock()
+
+
+def _build_session(host: str) -> requests.Session:
+    pool_size = HTTP_POOL_SIZES.get(host, HTTP_POOL_MAXSIZE)
+    # Only idempotent methods are retried after a response; connection failures are retried for all.
+    # Read timeouts are never retried (see _Retry).
+    retry = _Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF_SECONDS,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """Return this process's pooled session for the host of ``url``."""
+    global _sessions_pid
+    host = (urlsplit(url).hostname or "").lower()
+    with _sessions_lock:
+        # Pooled sockets must not be shared with a forked child, so start over in a new process.
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _build_session(host)
+        return session
+
+
+def _timeout(timeout) -> tuple[float, float]:
+    if timeout is None:
+        return HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS
+    if isinstance(timeout, tuple):
+        return timeout
+    return min(HTTP_CONNECT_TIMEOUT_SECONDS, timeout), timeout
+
+
+def get(url: str, timeout=None, **kwargs) -> requests.Response:
+    """``requests.get`` over a pooled session; a number ``timeout`` is the read timeout."""
+    return get_session(url).get(url, timeout=_timeout(timeout), **kwargs)
+
+
+def post(url: str, timeout=None, **kwargs) -> requests.Response:
+    """``requests.post`` over a pooled session; a number ``timeout`` is the read timeout."""
+    return get_session(url).post(url, timeout=_timeout(timeout), **kwargs)
+
+
+def prime(urls) -> None:
+    """Open a keep-alive connection to each URL's host so the first real request skips the handshake."""
+    for url in urls:
+        try:
+            get_session(url).head(url, timeout=_timeout(None), allow_redirects=False).close()
+        except requests.RequestException as exc:
+            logger.warning("Could not prime connection to %s: %s", urlsplit(url).hostname, exc)
@@ -0,0 +1,91 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    """Coalesce concurrent model calls into one batched call.
+
+    Callers submit input windows shaped ``(n, ...)``. A single worker thread waits
+    up to ``max_wait`` seconds after the first pending window for more to arrive,
+    stacks up to ``max_batch`` rows into one ``predict_fn`` call and hands every
+    caller back its own rows of the output.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch: int = 32, max_wait: float = 0.005):
+        self.predict_fn = predict_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[tuple[np.ndarray, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def start(self) -> None:
+        # Threads do not survive a fork, so each worker process starts its own.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+            self._thread.start()
+
+    def submit(self, inputs: np.ndarray) -> Future:
+        """Queue ``inputs`` for the next batch; the future resolves to the matching output rows."""
+        future: Future = Future()
+        self.start()
+        self._queue.put((np.asarray(inputs), future))
+        return future
+
+    def predict(self, inputs: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        return self.submit(inputs).result(timeout)
+
+    def _collect(self) -> list[tuple[np.ndarray, Future]]:
+        pending = [self._queue.get()]
+        rows = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(item)
+            rows += len(item[0])
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            pending = self._collect()
+            try:
+                self.run_batch(pending)
+            except Exception:
+                logger.exception("Inference batch failed")
+
+    def run_batch(self, pending: list[tuple[np.ndarray, Future]]) -> None:
+        """Run one model call for ``pending`` ``(inputs, future)`` pairs and resolve their futures."""
+        pending = [(inputs, future) for inputs, future in pending if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        try:
+            outputs = np.asarray(self.predict_fn(np.concatenate([inputs for inputs, _ in pending])))
+        except Exception as exc:
+            for _, future in pending:
+                future.set_exception(exc)
+            return
+        start = 0
+        for inputs, future in pending:
+            future.set_result(outputs[start: start + len(inputs)])
+            start += len(inputs)
@@ -1,4 +1,3 @@
-import numpy as np
 import matplotlib.pyplot as plt
 import pandas_datareader as web
 import datetime as dt
@@ -9,6 +8,8 @@ from tensorflow.keras.layers import LSTM, Dense, Dropout
 from sklearn.preprocessing import MinMaxScaler
 from tensorflow.keras.initializers import glorot_uniform
 
+from windowing import last_window, training_pairs
+
 # Define the company and time range
 company = 'SHOP'
 start = dt.datetime(2012, 1, 1)
@@ -25,16 +26,8 @@ scaled_data = scaler.fit_transform(data['Close'].values.reshape(-1, 1))
 # Define the prediction window
 prediction_day = 30
 
-# Prepare the training data
-x_train = []
-y_train = []
- 
-for x in range(prediction_day, len(scaled_data)):
-    x_train.append(scaled_data[x - prediction_day:x, 0])
-    y_train.append(scaled_data[x, 0])
-
-x_train, y_train = np.array(x_train), np.array(y_train)
-x_train = np.reshape(x_train, (x_train.shape[0], x_train.shape[1], 1))
+# Prepare the training data: (samples, prediction_day, 1) windows and the close after each
+x_train, y_train = training_pairs(scaled_data, prediction_day)
 model = Sequential()
 
 # Build the LSTM model
@@ -62,12 +55,7 @@ model_inputs = model_inputs.reshape(-1, 1)
 model_inputs = scaler.transform(model_inputs)
 
 # Prepare the test data
-x_test = []
-for x in range(prediction_day, len(model_inputs)):
-    x_test.append(model_inputs[x - prediction_day:x, 0])
-
-x_test = np.array(x_test)
-x_test = np.reshape(x_test, (x_test.shape[0], x_test.shape[1], 1))
+x_test, _ = training_pairs(model_inputs, prediction_day)
 
 # Make predictions
 predicted_prices = model.predict(x_test)
@@ -82,9 +70,7 @@ plt.plot(predicted_prices, color='green')
 plt.legend()
 plt.show()
 
-real_data = [model_inputs[len(model_inputs) - prediction_day:len(model_inputs), 0]]  # Adjusted indexing
-real_data = np.array(real_data)
-real_data = np.reshape(real_data, (real_data.shape[0], real_data.shape[1], 1))
+real_data = last_window(model_inputs, prediction_day)
 
 prediction = model.predict(real_data)
 prediction = scaler.inverse_transform(prediction)
@@ -1,81 +1,43 @@
 import json
-import os
-import numpy as np
-import yfinance as yf
-import tensorflow as tf
-from sklearn.preprocessing import MinMaxScaler
+import time
 
-MODEL_PATH = os.environ.get("MODEL_PATH", "stoc.h5")
-LOOKBACK = int(os.environ.get("LOOKBACK", "60"))
+_init_started = time.perf_counter()
 
-_model = None
+import prediction
+from prediction import MAX_BATCH_TICKERS, make_prediction, make_predictions, normalize_ticker
 
-def load_model_once():
-    global _model
-    if _model is None:
-        # compile=False is good for inference-only loads
-        _model = tf.keras.models.load_model(MODEL_PATH, compile=False)
-    return _model
+# This deployment scales each prediction over the last two years of closes.
+HISTORY_PERIOD = "2y"
 
-def get_close_prices(ticker: str):
-    t = ticker.upper().strip()
-
-    df = yf.download(
-        t,
-        period="2y",
-        interval="1d",
-        auto_adjust=True,
-        progress=False,
-        threads=False,
-    )
-
-    if df is None or df.empty:
-        raise ValueError(f"No price data returned from yfinance for ticker {t}")
-
-    # yfinance sometimes returns multi-index columns
-    if isinstance(df.columns, type(getattr(np, "array", object)())):
-        pass
-
-    # robust close extraction
-    close = None
-    for col in ["Close", ("Close", t), ("Adj Close", t), "Adj Close"]:
-        if col in df.columns:
-            close = df[col]
-            break
-
-    if close is None:
-        # fallback if columns are MultiIndex like ('Close','AAPL')
-        if hasattr(df.columns, "levels") and "Close" in df.columns.levels[0]:
-            close = df["Close"]
-            if hasattr(close, "columns") and close.shape[1] == 1:
-                close = close.iloc[:, 0]
-
-    if close is None:
-        raise ValueError("Could not find Close column in yfinance response")
-
-    close = close.dropna().astype(float).to_numpy().reshape(-1, 1)
-    if len(close) < LOOKBACK:
-        raise ValueError(f"Not enough data. Need at least {LOOKBACK} rows.")
-    return close
+def warm_up():
+    """Load libraries and the model and run a dummy inference; returns per-phase timings (ms)."""
+    timings = {"imports_ms": round((time.perf_counter() - _init_started) * 1000, 1)}
+    try:
+        timings.update(prediction.warm_up())
+    except Exception as e:
+        timings["warmup_error"] = str(e)
+    timings["total_ms"] = round((time.perf_counter() - _init_started) * 1000, 1)
+    return timings
 
 def predict_next(ticker: str):
-    close_prices = get_close_prices(ticker)
+    # Reused until the model or the ticker's last daily bar changes.
+    return make_prediction(ticker, period=HISTORY_PERIOD)
 
-    scaler = MinMaxScaler(feature_range=(0, 1))
-    scaled = scaler.fit_transform(close_prices)
+def predict_many(tickers):
+    """Cached results where possible; the rest load concurrently and share one forward pass."""
+    return make_predictions(tickers, period=HISTORY_PERIOD)
 
-    x_input = scaled[-LOOKBACK:].reshape(1, LOOKBACK, 1)
+# Runs during the Lambda init phase, so the first invocation finds everything loaded.
+INIT_TIMINGS = warm_up()
+_cold_start = True
 
-    model = load_model_once()
-    pred_scaled = model.predict(x_input, verbose=0)
-
-    predicted = scaler.inverse_transform(pred_scaled).flatten().tolist()
-    actual = close_prices[-LOOKBACK:].flatten().tolist()
-
-    # ensure plain floats for JSON
-    actual = [float(x) for x in actual]
-    predicted = [float(x) for x in predicted]
-    return actual, predicted
+def with_init_timings(payload):
+    """Attach the init timings to the first response served by this container."""
+    global _cold_start
+    if _cold_start:
+        _cold_start = False
+        payload["init_timings"] = INIT_TIMINGS
+    return payload
 
 def handler(event, context):
     try:
@@ -83,9 +45,34 @@ def handler(event, context):
         if isinstance(body, str):
             body = json.loads(body)
 
+        if "tickers" in body:
+            tickers = body["tickers"]
+            if not isinstance(tickers, list) or not tickers or len(tickers) > MAX_BATCH_TICKERS:
+                error = f"tickers must be a list of 1-{MAX_BATCH_TICKERS} symbols"
+                return {"statusCode": 400, "body": json.dumps({"error": error})}
+            results, errors = predict_many(tickers)
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Content-Type": "application/json",
+                    "Access-Control-Allow-Origin": "*",
+                },
+                "body": json.dumps(with_init_timings({
+                    "results": {
+                        t: {"actual_prices": actual, "predicted_prices": predicted}
+                        for t, (actual, predicted) in results.items()
+                    },
+                    "errors": errors,
+                })),
+            }
+
         ticker = (body.get("ticker") or "").strip()
         if not ticker:
             return {"statusCode": 400, "body": json.dumps({"error": "ticker is required"})}
+        try:
+            ticker = normalize_ticker(ticker)
+        except ValueError as e:
+            return {"statusCode": 400, "body": json.dumps({"error": str(e)})}
 
         actual, predicted = predict_next(ticker)
 
@@ -95,11 +82,11 @@ def handler(event, context):
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps({
+            "body": json.dumps(with_init_timings({
                 "ticker": ticker.upper(),
                 "actual_prices": actual,
                 "predicted_prices": predicted,
-            }),
+            })),
         }
 
     except Exception as e:
@@ -1,8 +1,36 @@
 import json
+import time
 import traceback
 from typing import Any, Dict
 
-from prediction import make_prediction
+_init_started = time.perf_counter()
+
+from prediction import MAX_BATCH_TICKERS, make_prediction, make_predictions, normalize_ticker, warm_up
+
+
+def _initialize() -> Dict[str, Any]:
+    """Cold-start pipeline, run once per container while Lambda initializes it."""
+    timings: Dict[str, Any] = {"imports_ms": round((time.perf_counter() - _init_started) * 1000, 1)}
+    try:
+        timings.update(warm_up())
+    except Exception as e:
+        # The first request loads whatever is missing and reports the real error.
+        timings["warmup_error"] = str(e)
+    timings["total_ms"] = round((time.perf_counter() - _init_started) * 1000, 1)
+    return timings
+
+
+INIT_TIMINGS = _initialize()
+_cold_start = True
+
+
+def with_init_timings(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the init timings to the first response served by this container."""
+    global _cold_start
+    if _cold_start:
+        _cold_start = False
+        payload["init_timings"] = INIT_TIMINGS
+    return payload
 
 
 def cors_headers() -> Dict[str, str]:
@@ -33,6 +61,32 @@ def parse_body(event: Dict[str, Any]) -> Dict[str, Any]:
     return event
 
 
+def handle_batch(tickers) -> Dict[str, Any]:
+    """{"tickers": [...]} -> {"results": {ticker: {...}}, "errors": {ticker: message}}"""
+    if not isinstance(tickers, list) or not tickers:
+        error = "tickers must be a non-empty list"
+    elif len(tickers) > MAX_BATCH_TICKERS:
+        error = f"At most {MAX_BATCH_TICKERS} tickers can be requested at once"
+    else:
+        error = None
+    if error:
+        return {"statusCode": 400, "headers": cors_headers(), "body": json.dumps({"error": error})}
+
+    results, errors = make_predictions(tickers)
+    payload = {
+        "results": {
+            ticker: {
+                "actual_prices": actual,
+                "predicted_prices": predicted,
+                "next_day_prediction": predicted[-1] if predicted else None,
+            }
+            for ticker, (actual, predicted) in results.items()
+        },
+        "errors": errors,
+    }
+    return {"statusCode": 200, "headers": cors_headers(), "body": json.dumps(with_init_timings(payload))}
+
+
 def handler(event, context):
     try:
         method = (
@@ -53,6 +107,9 @@ def handler(event, context):
             }
 
         body = parse_body(event)
+        if "tickers" in body:
+            return handle_batch(body["tickers"])
+
         ticker = str(body.get("ticker", "")).upper().strip()
         if not ticker:
             return {
@@ -60,6 +117,10 @@ def handler(event, context):
                 "headers": cors_headers(),
                 "body": json.dumps({"error": "ticker is required"}),
             }
+        try:
+            ticker = normalize_ticker(ticker)
+        except ValueError as e:
+            return {"statusCode": 400, "headers": cors_headers(), "body": json.dumps({"error": str(e)})}
 
         actual, predicted = make_prediction(ticker)
 
@@ -78,7 +139,7 @@ def handler(event, context):
         return {
             "statusCode": 200,
             "headers": cors_headers(),
-            "body": json.dumps(payload),
+            "body": json.dumps(with_init_timings(payload)),
         }
 
     except Exception as e:
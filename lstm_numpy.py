@@ -0,0 +1,164 @@
+"""Forward pass of the Keras ``Sequential`` LSTM models saved by k.py, in plain NumPy.
+
+Only inference is supported: Dropout is the identity, and the layer stack is
+read from the ``model_config`` stored in the ``.h5`` file, so TensorFlow is
+only needed to train a model.
+
+``python lstm_numpy.py stoc.h5 stoc.npz`` pre-converts the weights to a plain
+``.npz`` archive that loads in milliseconds without importing h5py.
+"""
+import json
+import sys
+
+import numpy as np
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 0.5 * (1.0 + np.tanh(0.5 * x)),  # same as 1/(1+e^-x), without overflow
+}
+_SKIPPED_LAYERS = {"InputLayer", "Dropout"}
+
+
+def _activation(name: str):
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Unsupported activation: {name}")
+    return _ACTIVATIONS[name]
+
+
+class LSTMLayer:
+    """Keras LSTM with gates ordered input, forget, cell, output."""
+
+    def __init__(self, kernel, recurrent_kernel, bias, activation="tanh", recurrent_activation="sigmoid", return_sequences=False):
+        self.kernel = np.asarray(kernel, dtype=np.float32)
+        self.recurrent_kernel = np.asarray(recurrent_kernel, dtype=np.float32)
+        self.bias = np.zeros(self.kernel.shape[1], np.float32) if bias is None else np.asarray(bias, dtype=np.float32)
+        self.units = self.recurrent_kernel.shape[0]
+        self.config = {
+            "class_name": "LSTM",
+            "activation": activation,
+            "recurrent_activation": recurrent_activation,
+            "return_sequences": return_sequences,
+        }
+        self.activation = _activation(activation)
+        self.recurrent_activation = _activation(recurrent_activation)
+        self.return_sequences = return_sequences
+
+    @property
+    def weights(self) -> list:
+        return [self.kernel, self.recurrent_kernel, self.bias]
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        batch, steps, _ = x.shape
+        units = self.units
+        # The input projection does not depend on the state, so do every timestep in one matmul.
+        projected = (x.reshape(batch * steps, -1) @ self.kernel + self.bias).reshape(batch, steps, 4 * units)
+        h = np.zeros((batch, units), np.float32)
+        c = np.zeros((batch, units), np.float32)
+        outputs = np.empty((batch, steps, units), np.float32) if self.return_sequences else None
+        for step in range(steps):
+            z = projected[:, step] + h @ self.recurrent_kernel
+            i = self.recurrent_activation(z[:, :units])
+            f = self.recurrent_activation(z[:, units: 2 * units])
+            g = self.activation(z[:, 2 * units: 3 * units])
+            o = self.recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * self.activation(c)
+            if outputs is not None:
+                outputs[:, step] = h
+        return outputs if outputs is not None else h
+
+
+class DenseLayer:
+    def __init__(self, kernel, bias, activation="linear"):
+        self.kernel = np.asarray(kernel, dtype=np.float32)
+        self.bias = np.zeros(self.kernel.shape[1], np.float32) if bias is None else np.asarray(bias, dtype=np.float32)
+        self.config = {"class_name": "Dense", "activation": activation}
+        self.activation = _activation(activation)
+
+    @property
+    def weights(self) -> list:
+        return [self.kernel, self.bias]
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return self.activation(x @ self.kernel + self.bias)
+
+
+class NumpySequentialModel:
+    """Drop-in for ``keras.Model.predict`` on the LSTM/Dense/Dropout stacks this project trains."""
+
+    def __init__(self, layers: list):
+        self.layers = layers
+
+    @classmethod
+    def from_h5(cls, path: str) -> "NumpySequentialModel":
+        import h5py
+
+        with h5py.File(path, "r") as handle:
+            config = json.loads(handle.attrs["model_config"])
+            if config["class_name"] != "Sequential":
+                raise ValueError(f"Only Sequential models are supported, got {config['class_name']}")
+            weights_root = handle["model_weights"] if "model_weights" in handle else handle
+            layers = []
+            for layer in config["config"]["layers"]:
+                kind, layer_config = layer["class_name"], layer["config"]
+                if kind in _SKIPPED_LAYERS:
+                    continue
+                group = weights_root[layer_config["name"]]
+                names = [name.decode() if isinstance(name, bytes) else name for name in group.attrs["weight_names"]]
+                weights = [np.asarray(group[name]) for name in names]
+                if kind == "LSTM":
+                    bias = weights[2] if layer_config.get("use_bias", True) else None
+                    layers.append(
+                        LSTMLayer(
+                            weights[0],
+                            weights[1],
+                            bias,
+                            activation=layer_config.get("activation", "tanh"),
+                            recurrent_activation=layer_config.get("recurrent_activation", "sigmoid"),
+                            return_sequences=layer_config.get("return_sequences", False),
+                        )
+                    )
+                elif kind == "Dense":
+                    bias = weights[1] if layer_config.get("use_bias", True) else None
+                    layers.append(DenseLayer(weights[0], bias, activation=layer_config.get("activation", "linear")))
+                else:
+                    raise ValueError(f"Unsupported layer type: {kind}")
+        return cls(layers)
+
+    @classmethod
+    def from_npz(cls, path: str) -> "NumpySequentialModel":
+        with np.load(path, allow_pickle=False) as archive:
+            layers = []
+            for index, config in enumerate(json.loads(str(archive["config"]))):
+                config = dict(config)
+                kind = config.pop("class_name")
+                weights = [archive[f"layer{index}_{position}"] for position in range(3 if kind == "LSTM" else 2)]
+                layers.append(LSTMLayer(*weights, **config) if kind == "LSTM" else DenseLayer(*weights, **config))
+        return cls(layers)
+
+    @classmethod
+    def load(cls, path: str) -> "NumpySequentialModel":
+        return cls.from_npz(path) if str(path).endswith(".npz") else cls.from_h5(path)
+
+    def save_npz(self, path: str) -> None:
+        arrays = {
+            f"layer{index}_{position}": weight
+            for index, layer in enumerate(self.layers)
+            for position, weight in enumerate(layer.weights)
+        }
+        np.savez(path, config=np.array(json.dumps([layer.config for layer in self.layers])), **arrays)
+
+    def predict(self, x: np.ndarray, batch_size=None, verbose=0) -> np.ndarray:
+        """Run the whole batch through every layer at once; ``batch_size``/``verbose`` mirror Keras."""
+        output = np.asarray(x, dtype=np.float32)
+        for layer in self.layers:
+            output = layer(output)
+        return output
+
+
+if __name__ == "__main__":
+    source, target = sys.argv[1:3]
+    NumpySequentialModel.from_h5(source).save_npz(target)
+    print(target)
@@ -1,5 +1,5 @@
 from flask import Flask, request, jsonify
-from prediction import make_prediction  # we'll use your existing model logic
+from prediction import MAX_BATCH_TICKERS, make_prediction, make_predictions, normalize_ticker  # we'll use your existing model logic
 
 app = Flask(__name__)
 
@@ -7,10 +7,16 @@ app = Flask(__name__)
 @app.route("/predict", methods=["POST"])
 def predict():
     data = request.get_json(force=True) or {}
+    if "tickers" in data:
+        return predict_batch(data["tickers"])
     ticker = data.get("ticker")
 
     if not ticker:
         return jsonify({"error": "ticker is required"}), 400
+    try:
+        ticker = normalize_ticker(ticker)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     try:
         actual, predicted = make_prediction(ticker)
@@ -28,5 +34,27 @@ def predict():
         return jsonify({"error": str(e)}), 500
 
 
+def predict_batch(tickers):
+    """{"tickers": [...]} -> {"results": {ticker: {...}}, "errors": {ticker: message}}"""
+    if not isinstance(tickers, list) or not tickers:
+        return jsonify({"error": "tickers must be a non-empty list"}), 400
+    if len(tickers) > MAX_BATCH_TICKERS:
+        return jsonify({"error": f"At most {MAX_BATCH_TICKERS} tickers can be requested at once"}), 400
+
+    try:
+        results, errors = make_predictions(tickers)
+    except Exception as e:
+        print(f"Batch prediction error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "results": {
+            ticker: {"actual_prices": actual, "predicted_prices": predicted}
+            for ticker, (actual, predicted) in results.items()
+        },
+        "errors": errors,
+    })
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=9000)
@@ -1,121 +1,213 @@
+import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-import pandas as pd
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import MinMaxScaler
-import yfinance as yf
 
-# Global model cache and scaler
+from inference_batcher import InferenceBatcher
+from prediction_cache import get_prediction_cache, model_version
+from price_history import get_price_history_store, normalize_ticker
+from windowing import last_window
+
+logger = logging.getLogger(__name__)
+
+# Global model cache
 MODEL = None
-SCALER = MinMaxScaler(feature_range=(0, 1))
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "stoc.h5")  # model file baked into the image
+MODEL_FILE = None  # the file MODEL was loaded from; prediction cache versions hash this file
+MODEL_PATH = os.environ.get("MODEL_PATH") or os.path.join(os.path.dirname(__file__), "stoc.h5")  # model file baked into the image
+# Weights pre-converted at image build (python lstm_numpy.py stoc.h5 stoc.npz); used by the numpy
+# engine when present and not older than the .h5, because they load without h5py.
+MODEL_NPZ_PATH = os.environ.get("MODEL_NPZ_PATH") or os.path.splitext(MODEL_PATH)[0] + ".npz"
+# "numpy" runs the forward pass from the .h5 weights without TensorFlow; "keras" loads the full model.
+PREDICTION_ENGINE = os.environ.get("PREDICTION_ENGINE", "numpy").lower()
+# Concurrent predictions are stacked into one model call of up to INFERENCE_MAX_BATCH windows,
+# waiting at most INFERENCE_MAX_WAIT_MS for company after the first one arrives.
+INFERENCE_MAX_BATCH = int(os.environ.get("INFERENCE_MAX_BATCH", "32"))
+INFERENCE_MAX_WAIT_MS = float(os.environ.get("INFERENCE_MAX_WAIT_MS", "5"))
+# Histories loaded in parallel by make_predictions; the window length the model was trained on.
+PREDICTION_FETCH_WORKERS = int(os.environ.get("PREDICTION_FETCH_WORKERS", "8"))
+MAX_BATCH_TICKERS = int(os.environ.get("MAX_BATCH_TICKERS", "50"))
+LOOKBACK = int(os.environ.get("LOOKBACK", "60"))
+# Daily history each prediction is scaled over; callers with a different window pass ``period``.
+HISTORY_PERIOD = "5y"
+
+def model_file(h5_path: str = MODEL_PATH, npz_path: str = MODEL_NPZ_PATH) -> str:
+    """The weights file to load: the pre-converted .npz for the numpy engine, unless it is missing or stale."""
+    if PREDICTION_ENGINE == "keras" or not os.path.exists(npz_path):
+        return h5_path
+    if os.path.exists(h5_path) and os.path.getmtime(npz_path) < os.path.getmtime(h5_path):
+        # A retrained .h5 next to an old conversion: serve the new weights, just without the faster load.
+        logger.warning("%s is older than %s; loading the .h5 (rerun lstm_numpy.py to refresh it)", npz_path, h5_path)
+        return h5_path
+    return npz_path
 
 def load_model_local():
-    """Load Keras model from local file inside the container."""
-    global MODEL
+    """Load the model from the local file inside the container."""
+    global MODEL, MODEL_FILE
     if MODEL is not None:
         return MODEL
 
-    if not os.path.exists(MODEL_PATH):
-        raise FileNotFoundError(f"Model file not found at {MODEL_PATH}")
+    path = model_file()
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model file not found at {path}")
+
+    if PREDICTION_ENGINE == "keras":
+        from tensorflow.keras.models import load_model
 
-    MODEL = load_model(MODEL_PATH)
+        MODEL = load_model(path, compile=False)
+    else:
+        from lstm_numpy import NumpySequentialModel
+
+        MODEL = NumpySequentialModel.load(path)
+    MODEL_FILE = path
     return MODEL
 
-def _load_price_series_from_yfinance(ticker: str, period: str = "5y"):
-    """
-    Load historical closing prices for the given ticker using yfinance.
-    """
-    t = ticker.upper().strip()
-    if not t:
-        raise ValueError("Ticker symbol is required")
+def current_model_version() -> str:
+    """Prediction cache version of the weights actually being served."""
+    load_model_local()
+    return model_version(MODEL_FILE)
 
-    # Fetch historical data (yf.download is usually faster/cleaner in Lambda)
-    df = yf.download(t, period=period, interval="1d", progress=False, threads=False)
+def _new_scaler():
+    # Imported on first use so that importing this module stays cheap.
+    from sklearn.preprocessing import MinMaxScaler
 
-    if df is None or df.empty:
-        raise ValueError(f"No price data returned from yfinance for ticker {t}")
+    return MinMaxScaler(feature_range=(0, 1))
 
-    # yfinance can sometimes return MultiIndex columns like ('Close', 'AAPL')
-    # or return df['Close'] as a DataFrame. Normalize this into a 1-D Series.
-    close_obj = None
+def warm_up():
+    """
+    Load the scaler library and the model and run one dummy inference, so the first
+    request does not pay for them. Returns per-phase timings in milliseconds.
+    """
+    timings = {}
+    started = time.perf_counter()
+    _new_scaler().fit_transform(np.arange(LOOKBACK, dtype=np.float32).reshape(-1, 1))
+    timings["libraries_ms"] = round((time.perf_counter() - started) * 1000, 1)
 
-    if isinstance(df.columns, pd.MultiIndex):
-        # Try the most common layouts
-        for key in [("Close", t), ("Adj Close", t), ("Close",), ("Adj Close",)]:
-            try:
-                close_obj = df[key]
-                if close_obj is not None:
-                    break
-            except Exception:
-                pass
-        if close_obj is None:
-            # Fallback: find any column whose first level is Close
-            try:
-                close_cols = [c for c in df.columns if str(c[0]).lower() == "close"]
-                if close_cols:
-                    close_obj = df[close_cols[0]]
-            except Exception:
-                close_obj = None
-    else:
-        # Standard single-index columns
-        if "Close" in df.columns:
-            close_obj = df["Close"]
-        elif "Adj Close" in df.columns:
-            close_obj = df["Adj Close"]
-
-    if close_obj is None:
-        raise ValueError(f"yfinance data for {t} does not contain a Close-like column")
-
-    # If Close came back as a DataFrame (e.g., multiple tickers), pick the ticker column if present
-    if isinstance(close_obj, pd.DataFrame):
-        if t in close_obj.columns:
-            close_series = close_obj[t]
-        else:
-            close_series = close_obj.iloc[:, 0]
-    else:
-        close_series = close_obj
+    started = time.perf_counter()
+    model = load_model_local()
+    timings["model_load_ms"] = round((time.perf_counter() - started) * 1000, 1)
 
-    # Ensure numeric close prices and drop non-numeric rows
-    close_series = pd.to_numeric(close_series, errors="coerce").dropna()
+    started = time.perf_counter()
+    model.predict(np.zeros((1, LOOKBACK, 1), dtype=np.float32), verbose=0)
+    timings["warmup_inference_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
 
-    if close_series.empty:
-        raise ValueError(f"No numeric closing price data for ticker {t}")
+def _predict_batch(windows: np.ndarray) -> np.ndarray:
+    return load_model_local().predict(windows, batch_size=len(windows), verbose=0)
 
-    close_prices = close_series.to_numpy(dtype=np.float32).reshape(-1, 1)
-    if close_prices.size == 0:
-        raise ValueError(f"No price data available for ticker {t}")
+inference_batcher = InferenceBatcher(_predict_batch, max_batch=INFERENCE_MAX_BATCH, max_wait=INFERENCE_MAX_WAIT_MS / 1000)
 
-    return close_prices
+def _load_price_series(ticker: str, period: str = HISTORY_PERIOD):
+    """
+    Load historical closing prices for the given ticker from the local price-history
+    store, which only downloads the bars it is missing.
+    """
+    return get_price_history_store().close_prices(normalize_ticker(ticker), period=period)
 
-def make_prediction(ticker: str):
+def make_prediction(ticker: str, period: str = HISTORY_PERIOD):
+    """
+    Make a prediction for the given ticker, reusing the cached result while the
+    model and the ticker's last daily bar are unchanged.
     """
-    Make a prediction for the given ticker using the Keras model and
-    historical prices fetched from yfinance.
+    t = normalize_ticker(ticker)
+    return get_prediction_cache().get_or_compute(
+        t,
+        current_model_version(),
+        last_bar=lambda: get_price_history_store().last_bar(t, period=period),
+        compute=lambda: _compute_prediction(t, period),
+        period=period,
+    )
+
+def _prepare_window(ticker: str, period: str = HISTORY_PERIOD):
     """
-    # 1. Load prices from yfinance
-    close_prices = _load_price_series_from_yfinance(ticker)
+    Load the ticker's closes and return ``(close_prices, scaler, x_input)`` for one
+    ``(1, lookback, 1)`` model input.
+    """
+    # 1. Load prices (local store, topped up from yfinance)
+    close_prices = _load_price_series(ticker, period)
 
-    # Fit scaler on this ticker's history (per-request). This matches your current local behavior.
-    scaled = SCALER.fit_transform(close_prices.astype(np.float32))
+    # Fit scaler on this ticker's history (per-request, so concurrent requests don't share state).
+    scaler = _new_scaler()
+    scaled = scaler.fit_transform(close_prices.astype(np.float32))
 
     # Make sure this matches your training window size
-    lookback = 60
-    if len(scaled) < lookback:
+    if len(scaled) < LOOKBACK:
         raise ValueError("Not enough data to predict")
 
-    x_input = scaled[-lookback:].reshape(1, lookback, 1).astype(np.float32)
-
-    # 3. Model & predict
-    model = load_model_local()
-    pred_scaled = model.predict(x_input, verbose=0)
+    x_input = last_window(scaled, LOOKBACK).astype(np.float32)
+    return close_prices, scaler, x_input
 
-    # 4. Inverse transform predictions
-    predicted = SCALER.inverse_transform(pred_scaled).flatten()
-    actual = close_prices[-lookback:].flatten()
+def _finish_prediction(close_prices, scaler, pred_scaled):
+    # Inverse transform predictions
+    predicted = scaler.inverse_transform(pred_scaled).flatten()
+    actual = close_prices[-LOOKBACK:].flatten()
 
     # Convert to plain Python floats for JSON-serializable output
     actual = [float(x) for x in actual]
     predicted = [float(x) for x in predicted]
 
     return actual, predicted
+
+def _compute_prediction(ticker: str, period: str = HISTORY_PERIOD):
+    """
+    Make a prediction for the given ticker using the LSTM model and
+    historical prices from the local price-history store.
+    """
+    close_prices, scaler, x_input = _prepare_window(ticker, period)
+
+    # Model & predict, batched with any other requests in flight
+    pred_scaled = inference_batcher.predict(x_input)
+
+    return _finish_prediction(close_prices, scaler, pred_scaled)
+
+def make_predictions(tickers, period: str = HISTORY_PERIOD):
+    """
+    Predict many tickers at once: cached results are reused, the remaining histories
+    are loaded concurrently, and every window goes through a single model call.
+
+    Returns ``(results, errors)``: ``{ticker: (actual, predicted)}`` and ``{ticker: message}``.
+    """
+    version = current_model_version()
+    cache = get_prediction_cache()
+    store = get_price_history_store()
+
+    def load(t):
+        normalize_ticker(t)  # refused per ticker, before it reaches the cache keys or the store
+        found = cache.cached(t, version, period)
+        if found is not None:
+            return found, None
+        bar = store.last_bar(t, period=period)
+        found = cache.lookup(t, version, bar, period)
+        if found is not None:
+            return found, None
+        return None, (bar, _prepare_window(t, period))
+
+    tickers = list(dict.fromkeys(str(t).upper().strip() for t in tickers if str(t).strip()))
+    results, errors, pending = {}, {}, {}
+    if not tickers:
+        return results, errors
+    with ThreadPoolExecutor(max_workers=min(PREDICTION_FETCH_WORKERS, len(tickers))) as pool:
+        futures = {t: pool.submit(load, t) for t in tickers}
+        for t, future in futures.items():
+            try:
+                found, prepared = future.result()
+            except Exception as exc:
+                errors[t] = str(exc)
+                continue
+            if found is not None:
+                results[t] = found
+            else:
+                pending[t] = prepared
+
+    if pending:
+        windows = np.concatenate([x_input for _bar, (_closes, _scaler, x_input) in pending.values()])
+        try:
+            outputs = inference_batcher.predict(windows)
+        except Exception as exc:
+            errors.update({t: str(exc) for t in pending})
+            return results, errors
+        for row, (t, (bar, (close_prices, scaler, _x))) in enumerate(pending.items()):
+            results[t] = _finish_prediction(close_prices, scaler, outputs[row: row + 1])
+            cache.store(t, version, bar, results[t], period)
+    return results, errors
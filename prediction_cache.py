@@ -0,0 +1,113 @@
+"""Prediction results keyed by (ticker, model version, history period, last daily bar).
+
+A prediction only changes when the model file or the ticker's latest close does (the
+last bar is identified by its date and close, so a bar stored mid-session and its final
+close are different entries; the history period is part of the key because the scaler
+is fit over that window),
+so results are kept in memory for the price-history refresh window and persisted in
+``PREDICTION_CACHE_URL`` (a ``shared_cache`` URL, SQLite by default) across restarts.
+"""
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from price_history import PRICE_HISTORY_REFRESH_SECONDS
+from shared_cache import NullCache, create_shared_cache
+from ttl_cache import TTLCache
+
+PREDICTION_CACHE_URL = os.environ.get(
+    "PREDICTION_CACHE_URL",
+    "sqlite:///"
+    + ("/tmp/prediction_cache.sqlite3" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else str(Path(__file__).with_name("prediction_cache.sqlite3"))),
+)
+# Persisted entries are only looked up while their bar is the latest one; this just bounds the file.
+PREDICTION_CACHE_DAYS = float(os.environ.get("PREDICTION_CACHE_DAYS", "7"))
+PREDICTION_CACHE_MAX_ENTRIES = int(os.environ.get("PREDICTION_CACHE_MAX_ENTRIES", "1000"))
+
+_versions: dict[tuple, str] = {}
+_versions_lock = threading.Lock()
+
+
+def model_version(path: str) -> str:
+    """Short content hash of the model file, recomputed only when its size or mtime change."""
+    stat = os.stat(path)
+    signature = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _versions_lock:
+        version = _versions.get(signature)
+    if version is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+        version = digest.hexdigest()[:16]
+        with _versions_lock:
+            _versions[signature] = version
+    return version
+
+
+class PredictionCache:
+    """Two-level cache: an in-process front that skips even the bar lookup, then a persistent backend."""
+
+    def __init__(
+        self,
+        backend: NullCache,
+        memory_ttl: float = PRICE_HISTORY_REFRESH_SECONDS,
+        ttl: float = PREDICTION_CACHE_DAYS * 86400,
+        maxsize: int = PREDICTION_CACHE_MAX_ENTRIES,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize, ttl=memory_ttl)
+
+    def cached(self, ticker: str, version: str, period: str = "5y") -> Optional[tuple]:
+        """Result from the in-process front, which is trusted without looking up the last bar."""
+        return self.memory.get((version, period, ticker))
+
+    def lookup(self, ticker: str, version: str, last_bar: str, period: str = "5y") -> Optional[tuple]:
+        stored = self.backend.get(self._key(ticker, version, last_bar, period))
+        if stored is None:
+            return None
+        result = tuple(stored[0])
+        self.memory.set((version, period, ticker), result)
+        return result
+
+    def store(self, ticker: str, version: str, last_bar: str, result: tuple, period: str = "5y") -> None:
+        self.backend.set(self._key(ticker, version, last_bar, period), list(result), self.ttl)
+        self.memory.set((version, period, ticker), tuple(result))
+
+    def get_or_compute(
+        self, ticker: str, version: str, last_bar: Callable[[], str], compute: Callable[[], tuple], period: str = "5y"
+    ) -> tuple:
+        """Return ``compute()`` for the ticker's current last bar, reusing any earlier result for it."""
+        found = self.cached(ticker, version, period)
+        if found is not None:
+            return found
+
+        bar = str(last_bar())
+        found = self.lookup(ticker, version, bar, period)
+        if found is None:
+            found = tuple(compute())
+            self.store(ticker, version, bar, found, period)
+        return found
+
+    @staticmethod
+    def _key(ticker: str, version: str, last_bar: str, period: str) -> str:
+        return f"prediction:{version}:{period}:{ticker}:{last_bar}"
+
+    def clear(self) -> None:
+        self.memory.clear()
+
+
+_cache: Optional[PredictionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PredictionCache(create_shared_cache(PREDICTION_CACHE_URL))
+    return _cache
@@ -0,0 +1,205 @@
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from columnar import OHLCV_DTYPES, open_table, write_table
+
+logger = logging.getLogger(__name__)
+
+# Daily OHLCV bars kept on local disk per ticker and topped up with only the bars that are
+# missing, so predictions stop downloading years of history on every request.
+PRICE_HISTORY_DIR = os.environ.get("PRICE_HISTORY_DIR") or (
+    "/tmp/price_history" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else str(Path(__file__).with_name("price_history"))
+)
+# How long a stored history is trusted before asking yfinance for newer bars.
+PRICE_HISTORY_REFRESH_SECONDS = int(os.environ.get("PRICE_HISTORY_REFRESH_SECONDS", "3600"))
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+TICKER_RE = re.compile(r"^[A-Z0-9][A-Z0-9.\-^=]{0,14}$")
+
+
+def normalize_ticker(value: object) -> str:
+    ticker = str(value or "").strip().upper()
+    if not TICKER_RE.fullmatch(ticker):
+        raise ValueError("Ticker must be 1-15 valid symbol characters")
+    return ticker
+
+
+def _pick_column(df, name: str, ticker: str):
+    """Return a 1-D column from a yfinance frame, whose columns may be a (field, ticker) MultiIndex."""
+    import pandas as pd
+
+    if isinstance(df.columns, pd.MultiIndex):
+        matches = [column for column in df.columns if str(column[0]).lower() == name]
+        preferred = [column for column in matches if len(column) > 1 and str(column[1]).upper() == ticker]
+        column = (preferred or matches or [None])[0]
+        return None if column is None else df[column]
+    for column in df.columns:
+        if str(column).lower() == name:
+            return df[column]
+    return None
+
+
+def frame_to_columns(df, ticker: str) -> dict[str, np.ndarray]:
+    """Convert a yfinance daily frame into date-indexed NumPy columns, dropping incomplete rows."""
+    import pandas as pd
+
+    if df is None or df.empty:
+        raise ValueError(f"No price data returned from yfinance for ticker {ticker}")
+
+    close = _pick_column(df, "close", ticker)
+    if close is None:
+        close = _pick_column(df, "adj close", ticker)
+    if close is None:
+        raise ValueError(f"yfinance data for {ticker} does not contain a Close-like column")
+
+    frame = pd.DataFrame({"close": pd.to_numeric(close, errors="coerce")}, index=pd.DatetimeIndex(df.index))
+    for name in ("open", "high", "low", "volume"):
+        column = _pick_column(df, name, ticker)
+        frame[name] = pd.to_numeric(column, errors="coerce") if column is not None else frame["close"]
+    frame = frame.dropna(subset=["close"])
+    for name in ("open", "high", "low"):
+        frame[name] = frame[name].fillna(frame["close"])
+    frame["volume"] = frame["volume"].fillna(0)
+
+    index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+    columns = {"date": index.values.astype("datetime64[D]").astype(np.int64)}
+    for name in (*PRICE_COLUMNS, "volume"):
+        columns[name] = frame[name].to_numpy().astype(OHLCV_DTYPES[name])
+    return columns
+
+
+def period_days(period: str) -> int:
+    """Length in calendar days of a yfinance-style period such as ``5y``, ``6mo`` or ``30d``."""
+    for suffix, days in (("mo", 31), ("y", 366), ("d", 1)):
+        if period.endswith(suffix) and period[: -len(suffix)].isdigit():
+            return int(period[: -len(suffix)]) * days
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def _yfinance_download(ticker: str, **params):
+    import yfinance as yf
+
+    return yf.download(ticker, interval="1d", auto_adjust=True, progress=False, threads=False, **params)
+
+
+class PriceHistoryStore:
+    """Per-ticker daily bars, each ticker in one memory-mapped ``<TICKER>.ohlcv`` columnar file.
+
+    Files are rewritten whole and renamed into place, so readers always see a
+    consistent snapshot.
+    """
+
+    def __init__(
+        self,
+        root: str = PRICE_HISTORY_DIR,
+        refresh_seconds: float = PRICE_HISTORY_REFRESH_SECONDS,
+        download: Optional[Callable] = None,
+    ):
+        self.root = Path(root)
+        self.refresh_seconds = refresh_seconds
+        self.download = download or _yfinance_download
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def path(self, ticker: str) -> Path:
+        # The ticker becomes a file name, so anything but a plain symbol is refused here.
+        return self.root / f"{normalize_ticker(ticker)}.ohlcv"
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def load_with_meta(self, ticker: str) -> tuple[Optional[dict[str, np.ndarray]], dict]:
+        path = self.path(ticker)
+        try:
+            columns, meta = open_table(path)
+        except (FileNotFoundError, ValueError):
+            return None, {}
+        if set(columns) != set(OHLCV_DTYPES):
+            return None, {}
+        return columns, meta
+
+    def load(self, ticker: str) -> Optional[dict[str, np.ndarray]]:
+        """Return the stored columns as read-only memory-mapped views, or None when nothing is stored."""
+        return self.load_with_meta(ticker)[0]
+
+    def save(self, ticker: str, columns: dict[str, np.ndarray], covers_from: int) -> None:
+        """Store ``columns``; ``covers_from`` is the first day the history was requested from."""
+        write_table(
+            self.path(ticker),
+            {name: columns[name] for name in OHLCV_DTYPES},
+            meta={"ticker": ticker, "checked_at": time.time(), "covers_from": int(covers_from)},
+        )
+
+    def update(self, ticker: str, period: str = "5y") -> dict[str, np.ndarray]:
+        """Return the ticker's history, fetching only the bars added since the last check."""
+        with self._lock(ticker):
+            stored, meta = self.load_with_meta(ticker)
+            wanted_from = int(np.datetime64("today", "D").astype(np.int64)) - period_days(period)
+            covers_from = meta.get("covers_from", wanted_from)
+            if stored is None or len(stored["date"]) < 2 or wanted_from < covers_from:
+                columns = frame_to_columns(self.download(ticker, period=period), ticker)
+                self.save(ticker, columns, covers_from=wanted_from)
+                return self.load(ticker)
+            if time.time() - meta.get("checked_at", 0) < self.refresh_seconds:
+                return stored
+
+            try:
+                columns, covers_from = self._top_up(ticker, stored, covers_from, wanted_from, period)
+            except Exception:
+                # Keep serving what is stored; checking again is left to the next refresh window
+                # rather than to every request while yfinance is failing.
+                logger.warning("Price history top-up failed for %s; serving stored bars", ticker, exc_info=True)
+                columns = stored
+            self.save(ticker, columns, covers_from=covers_from)
+            return self.load(ticker)
+
+    def _top_up(self, ticker: str, stored: dict[str, np.ndarray], covers_from: int, wanted_from: int, period: str):
+        """Stored history extended with the bars added since it was saved, and the day it now covers from."""
+        # Refetch from the last completed stored bar: the final stored bar may have been an
+        # intraday snapshot, and a changed overlap bar means the history was re-adjusted
+        # (split or dividend), which needs a full reload.
+        overlap_day = int(stored["date"][-2])
+        start = np.datetime64(overlap_day, "D").astype(str)
+        recent = frame_to_columns(self.download(ticker, start=start), ticker)
+        overlap = np.flatnonzero(recent["date"] == overlap_day)
+        if not overlap.size or not np.isclose(recent["close"][overlap[0]], stored["close"][-2], rtol=1e-4):
+            return frame_to_columns(self.download(ticker, period=period), ticker), wanted_from
+        keep = len(stored["date"]) - 1
+        new_rows = recent["date"] > overlap_day
+        return {name: np.concatenate([stored[name][:keep], recent[name][new_rows]]) for name in OHLCV_DTYPES}, covers_from
+
+    def last_bar(self, ticker: str, period: str = "5y") -> str:
+        """
+        Revision of the ticker's latest stored bar, topping it up first: its day number (days
+        since 1970-01-01) and close, so an intraday snapshot and that day's final bar differ.
+        """
+        history = self.update(ticker, period=period)
+        return f"{int(history['date'][-1])}:{float(history['close'][-1])!r}"
+
+    def close_prices(self, ticker: str, min_rows: int = 1, period: str = "5y") -> np.ndarray:
+        """Return the last ``period`` of closing prices as a ``(n, 1)`` float32 array, oldest first."""
+        history = self.update(ticker, period=period)
+        today = np.datetime64("today", "D").astype(np.int64)
+        start = int(np.searchsorted(history["date"], today - period_days(period)))
+        closes = np.asarray(history["close"][start:], dtype=np.float32)
+        if len(closes) < min_rows:
+            raise ValueError(f"Not enough data. Need at least {min_rows} rows.")
+        return closes.reshape(-1, 1)
+
+
+_store: Optional[PriceHistoryStore] = None
+
+
+def get_price_history_store() -> PriceHistoryStore:
+    global _store
+    if _store is None:
+        _store = PriceHistoryStore()
+    return _store
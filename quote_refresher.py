@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HotSymbolRefresher:
+    """Keep the most requested symbols warm by refreshing them shortly before they expire.
+
+    Request counts decay with ``half_life`` so the hot set follows current traffic.
+    Refreshes draw from a token bucket filled at ``credits_per_minute / 60`` per
+    second, which spreads upstream calls evenly and keeps them within the budget.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[list[str]], None],
+        expires_in: Callable[[str], Optional[float]],
+        credits_per_minute: float,
+        max_symbols: int = 20,
+        lead_seconds: float = 10.0,
+        interval: float = 1.0,
+        half_life: float = 300.0,
+    ):
+        self.refresh = refresh
+        self.expires_in = expires_in
+        self.credits_per_minute = credits_per_minute
+        self.max_symbols = max_symbols
+        self.lead_seconds = lead_seconds
+        self.interval = interval
+        self.half_life = half_life
+        self._rate = credits_per_minute / 60.0
+        self._capacity = max(1.0, self._rate * lead_seconds)
+        self._lock = threading.Lock()
+        self._scores: dict[str, float] = {}
+        self._tokens = 0.0
+        self._last_tick = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.credits_per_minute > 0 and self.max_symbols > 0
+
+    def record(self, symbols: Iterable[str]) -> None:
+        """Count requests for ``symbols`` and make sure the refresh loop is running."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for symbol in symbols:
+                self._scores[symbol] = self._scores.get(symbol, 0.0) + 1.0
+            if len(self._scores) > self.max_symbols * 10:
+                keep = sorted(self._scores, key=self._scores.get, reverse=True)[: self.max_symbols * 2]
+                self._scores = {symbol: self._scores[symbol] for symbol in keep}
+        self.start()
+
+    def hot_symbols(self) -> list[str]:
+        with self._lock:
+            return sorted(self._scores, key=self._scores.get, reverse=True)[: self.max_symbols]
+
+    def start(self) -> None:
+        # Threads do not survive a fork, so a worker forked from a preloaded master starts its own.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._last_tick = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="hot-quote-refresher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Hot symbol refresh failed")
+            time.sleep(self.interval)
+
+    def run_once(self, now: Optional[float] = None) -> list[str]:
+        """Refresh the hottest symbols that are due, as far as the credit budget allows."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            elapsed = max(now - self._last_tick, 0.0)
+            self._last_tick = now
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+            decay = 0.5 ** (elapsed / self.half_life)
+            self._scores = {symbol: score * decay for symbol, score in self._scores.items() if score * decay >= 0.01}
+
+        due = []
+        for symbol in self.hot_symbols():
+            left = self.expires_in(symbol)
+            if left is None or left <= self.lead_seconds:
+                due.append(symbol)
+
+        with self._lock:
+            batch = due[: int(self._tokens)]
+            self._tokens -= len(batch)
+        if batch:
+            self.refresh(batch)
+        return batch
@@ -0,0 +1,108 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Pending price changes for one client, coalesced so a slow reader only sees the latest values."""
+
+    def __init__(self, symbols: Iterable[str]):
+        self.symbols = frozenset(symbols)
+        self._cond = threading.Condition()
+        self._pending: dict[str, dict] = {}
+
+    def push(self, quotes: dict[str, dict]) -> None:
+        with self._cond:
+            self._pending.update(quotes)
+            self._cond.notify()
+
+    def get(self, timeout: float) -> dict[str, dict]:
+        """Wait up to ``timeout`` seconds for changes; returns an empty dict when there are none."""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            pending, self._pending = self._pending, {}
+            return pending
+
+
+class QuoteBroadcaster:
+    """One refresh loop shared by every streaming client of this worker.
+
+    Each tick fetches the union of subscribed symbols once and pushes only the
+    quotes that changed since the previous tick to the clients watching them.
+    """
+
+    def __init__(self, fetch: Callable[[list[str]], tuple[dict, dict]], interval: float = 5.0):
+        self.fetch = fetch
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
+        self._latest: dict[str, dict] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self, symbols: Iterable[str], max_subscribers: Optional[int] = None) -> Optional[Subscription]:
+        """Register a client for ``symbols``; returns None when ``max_subscribers`` are already watching."""
+        subscription = Subscription(symbols)
+        with self._lock:
+            if max_subscribers is not None and len(self._subscribers) >= max_subscribers:
+                return None
+            self._subscribers.add(subscription)
+            # Give new clients the last known prices right away instead of after the next tick.
+            snapshot = {symbol: self._latest[symbol] for symbol in subscription.symbols if symbol in self._latest}
+        if snapshot:
+            subscription.push(snapshot)
+        self.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="quote-broadcaster", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Quote broadcast failed")
+            time.sleep(max(self.interval - (time.monotonic() - started), 0.1))
+
+    def run_once(self) -> dict[str, dict]:
+        """Fetch every watched symbol once and push changes; returns the changed quotes."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            watched = sorted({symbol for subscription in subscribers for symbol in subscription.symbols})
+            # Forget prices nobody watches so the next subscriber gets a fresh snapshot.
+            self._latest = {symbol: quote for symbol, quote in self._latest.items() if symbol in watched}
+        if not watched:
+            return {}
+
+        quotes, _errors = self.fetch(watched)
+        with self._lock:
+            changed = {symbol: quote for symbol, quote in quotes.items() if self._latest.get(symbol) != quote}
+            self._latest.update(changed)
+        if changed:
+            for subscription in subscribers:
+                update = {symbol: quote for symbol, quote in changed.items() if symbol in subscription.symbols}
+                if update:
+                    subscription.push(update)
+        return changed
@@ -0,0 +1,168 @@
+"""Cache backends shared by every gunicorn worker on a host (or fleet, with Redis).
+
+Configure with ``SHARED_CACHE_URL``:
+
+    sqlite:///stockie-cache.sqlite3      relative to the working directory
+    sqlite:////var/cache/stockie.sqlite3 absolute path
+    redis://localhost:6379/1             needs the optional ``redis`` package
+
+When unset, ``NullCache`` is used and every worker relies on its in-process cache only.
+Values must be JSON-serializable. Backend failures are logged and treated as misses
+so a broken cache never fails a request.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "stockie:"
+
+
+class NullCache:
+    """Backend used when no shared cache is configured."""
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, tuple[object, float]]:
+        return {}
+
+    def set_many(self, items: dict[str, object], ttl: float) -> None:
+        pass
+
+    def get(self, key: str) -> Optional[tuple[object, float]]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: object, ttl: float) -> None:
+        self.set_many({key: value}, ttl)
+
+
+class SQLiteCache(NullCache):
+    """Shared cache in a local SQLite file; works across forked workers with no extra service.
+
+    ``get_many`` maps each live key to ``(value, seconds_left)``.
+    """
+
+    PRUNE_INTERVAL_SECONDS = 60
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._last_prune = 0.0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross threads or survive a fork, so keep one per (pid, thread).
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, tuple[object, float]]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = time.time()
+        try:
+            rows = self._connection().execute(
+                f"SELECT key, expires_at, value FROM cache WHERE key IN ({','.join('?' * len(keys))}) AND expires_at > ?",
+                [*keys, now],
+            ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("Shared cache read failed: %s", exc)
+            return {}
+        return {key: (json.loads(value), expires_at - now) for key, expires_at, value in rows}
+
+    def set_many(self, items: dict[str, object], ttl: float) -> None:
+        if not items:
+            return
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                [(key, now + ttl, json.dumps(value)) for key, value in items.items()],
+            )
+            if now - self._last_prune >= self.PRUNE_INTERVAL_SECONDS:
+                self._last_prune = now
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as exc:
+            logger.warning("Shared cache write failed: %s", exc)
+
+
+class RedisCache(NullCache):
+    """Shared cache in Redis, for deployments that already run it (see celery_config.py)."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("Install the redis package to use a redis:// SHARED_CACHE_URL") from exc
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, tuple[object, float]]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(KEY_PREFIX + key)
+                pipe.pttl(KEY_PREFIX + key)
+            replies = pipe.execute()
+        except self._errors as exc:
+            logger.warning("Shared cache read failed: %s", exc)
+            return {}
+        found = {}
+        for key, value, ttl_ms in zip(keys, replies[::2], replies[1::2]):
+            if value is not None and ttl_ms and ttl_ms > 0:
+                found[key] = (json.loads(value), ttl_ms / 1000)
+        return found
+
+    def set_many(self, items: dict[str, object], ttl: float) -> None:
+        if not items:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(KEY_PREFIX + key, json.dumps(value), px=max(int(ttl * 1000), 1))
+            pipe.execute()
+        except self._errors as exc:
+            logger.warning("Shared cache write failed: %s", exc)
+
+
+def create_shared_cache(url: Optional[str]) -> NullCache:
+    url = (url or "").strip()
+    if not url:
+        return NullCache()
+    if url.startswith("sqlite:///"):
+        return SQLiteCache(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache(url)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL scheme: {url.split(':', 1)[0]}")
+
+
+_shared_cache: Optional[NullCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> NullCache:
+    """Return the process-wide backend configured by ``SHARED_CACHE_URL``."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = create_shared_cache(os.environ.get("SHARED_CACHE_URL"))
+    return _shared_cache
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, Iterable
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single in-flight execution.
+
+    The first caller for a key becomes the leader and runs the work; callers that
+    arrive while it is still running wait on the leader's result instead of
+    repeating the work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, fn: Callable[[], object]):
+        """Run ``fn`` once per concurrent wave of callers for ``key`` and return its result."""
+        return self.do_many([key], lambda _keys: {key: fn()})[key].result()
+
+    def do_many(self, keys: Iterable[Hashable], fn: Callable[[list], dict]) -> dict[Hashable, Future]:
+        """Resolve many keys, running ``fn`` once for the keys nobody else is fetching.
+
+        ``fn`` receives the list of keys this caller leads and returns a mapping of
+        key to result; an exception instance as a value fails only that key. Returns
+        a completed future per requested key.
+        """
+        futures: dict[Hashable, Future] = {}
+        led: list = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                future = self._calls.get(key)
+                if future is None:
+                    future = Future()
+                    self._calls[key] = future
+                    led.append(key)
+                futures[key] = future
+
+        if led:
+            try:
+                results = fn(led)
+            except BaseException as exc:
+                results = {key: exc for key in led}
+            finally:
+                with self._lock:
+                    for key in led:
+                        self._calls.pop(key, None)
+
+            for key in led:
+                result = results.get(key, KeyError(key))
+                if isinstance(result, BaseException):
+                    futures[key].set_exception(result)
+                else:
+                    futures[key].set_result(result)
+
+        for future in futures.values():
+            future.exception()  # wait for keys led by other callers
+        return futures
@@ -3,6 +3,8 @@ var tickers = JSON.parse(localStorage.getItem("tickers")) || [];
 var lastPrices = {};
 var counter = 13;
 var priceChart = null;
+var priceStream = null;
+var pollTimer = null;
 const TICKER_PATTERN = /^[A-Z0-9][A-Z0-9.\-^=]{0,14}$/;
 
 function normalizeTicker(value) {
@@ -78,59 +80,97 @@ function updatePrice(ticker) {
     });
 }
 
-function updatePrices() {
-    tickers.forEach(function (ticker) {
-        $.ajax({
-            url: "/get_stock_data",
-            type: "POST",
-            data: JSON.stringify({ ticker: ticker }),
-            contentType: "application/json; charset=utf-8",
-            dataType: "json",
-            success: function (data) {
-                if (data.error) {
-                    console.error(`Error fetching ${ticker}: ${data.error}`);
-                    return;
-                }
+function renderQuote(ticker, data) {
+    var changePercent = ((data.currentPrice - data.openPrice) / data.openPrice) * 100;
+    var colorClass;
+
+    if (changePercent <= -2) {
+        colorClass = "dark-red";
+    } else if (changePercent < 0) {
+        colorClass = "red";
+    } else if (changePercent <= 2) {
+        colorClass = "green";
+    } else {
+        colorClass = "dark-green";
+    }
 
-                var changePercent = ((data.currentPrice - data.openPrice) / data.openPrice) * 100;
-                var colorClass;
-
-                if (changePercent <= -2) {
-                    colorClass = "dark-red";
-                } else if (changePercent < 0) {
-                    colorClass = "red";
-                } else if (changePercent <= 2) {
-                    colorClass = "green";
-                } else {
-                    colorClass = "dark-green";
-                }
+    $(`#${ticker}-price`).text(`$${data.currentPrice.toFixed(2)}`);
+    $(`#${ticker}-pct`).text(`${changePercent.toFixed(2)}%`);
+    $(`#${ticker}-price`).removeClass("dark-red red green dark-green").addClass(colorClass);
+    $(`#${ticker}-pct`).removeClass("dark-red red green dark-green").addClass(colorClass);
 
-                $(`#${ticker}-price`).text(`$${data.currentPrice.toFixed(2)}`);
-                $(`#${ticker}-pct`).text(`${changePercent.toFixed(2)}%`);
-                $(`#${ticker}-price`).removeClass("dark-red red green dark-green").addClass(colorClass);
-                $(`#${ticker}-pct`).removeClass("dark-red red green dark-green").addClass(colorClass);
+    var flashClass;
+    if (lastPrices[ticker] > data.currentPrice) {
+        flashClass = "red-flash";
+    } else if (lastPrices[ticker] < data.currentPrice) {
+        flashClass = "green-flash";
+    }
 
-                var flashClass;
-                if (lastPrices[ticker] > data.currentPrice) {
-                    flashClass = "red-flash";
-                } else if (lastPrices[ticker] < data.currentPrice) {
-                    flashClass = "green-flash";
-                }
+    lastPrices[ticker] = data.currentPrice;
 
-                lastPrices[ticker] = data.currentPrice;
+    if (flashClass) {
+        $(`#${ticker}-price, #${ticker}-pct`).addClass(flashClass);
+        setTimeout(function () {
+            $(`#${ticker}-price, #${ticker}-pct`).removeClass(flashClass);
+        }, 650);
+    }
+}
 
-                if (flashClass) {
-                    $(`#${ticker}-price, #${ticker}-pct`).addClass(flashClass);
-                    setTimeout(function () {
-                        $(`#${ticker}-price, #${ticker}-pct`).removeClass(flashClass);
-                    }, 650);
-                }
-            },
-            error: function (xhr) {
-                console.error(`Error fetching ${ticker}: ${xhr.responseText}`);
+function updatePrices() {
+    if (!tickers.length) return;
+
+    // One batched request per refresh instead of one request per ticker.
+    $.ajax({
+        url: "/quotes",
+        type: "POST",
+        data: JSON.stringify({ symbols: tickers }),
+        contentType: "application/json; charset=utf-8",
+        dataType: "json",
+        success: function (data) {
+            if (data.error) {
+                console.error(`Error fetching quotes: ${data.error}`);
+                return;
             }
+
+            Object.entries(data.quotes || {}).forEach(function ([ticker, quote]) {
+                renderQuote(ticker, quote);
+            });
+            Object.entries(data.errors || {}).forEach(function ([ticker, message]) {
+                console.error(`Error fetching ${ticker}: ${message}`);
+            });
+        },
+        error: function (xhr) {
+            console.error(`Error fetching quotes: ${xhr.responseText}`);
+        }
+    });
+}
+
+function startPolling() {
+    if (pollTimer) return;
+    pollTimer = setInterval(updatePrices, 13000);
+}
+
+// Subscribe to pushed price changes; falls back to polling when streaming is unavailable.
+function startPriceStream() {
+    if (priceStream) priceStream.close();
+    priceStream = null;
+    if (!tickers.length || typeof EventSource === "undefined") return false;
+
+    priceStream = new EventSource("/quotes/stream?symbols=" + encodeURIComponent(tickers.join(",")));
+    priceStream.addEventListener("quotes", function (event) {
+        const data = JSON.parse(event.data);
+        Object.entries(data.quotes || {}).forEach(function ([ticker, quote]) {
+            renderQuote(ticker, quote);
         });
     });
+    priceStream.onerror = function () {
+        // The browser reconnects by itself unless the server refused the stream.
+        if (priceStream && priceStream.readyState === EventSource.CLOSED) {
+            priceStream = null;
+            startPolling();
+        }
+    };
+    return true;
 }
 
 function renderDetailsBox(ticker) {
@@ -360,6 +400,7 @@ function initMiddle() {
             localStorage.setItem("tickers", JSON.stringify(tickers));
             addTickerToGrid(newTicker);
             updatePrice(newTicker);
+            if (!pollTimer) startPriceStream();
         }
 
         $("#new-ticker").val("");
@@ -370,6 +411,7 @@ function initMiddle() {
         tickers = tickers.filter((t) => t !== tickerToRemove);
         localStorage.setItem("tickers", JSON.stringify(tickers));
         $("#" + tickerToRemove).remove();
+        if (!pollTimer) startPriceStream();
         if (!tickers.length) {
             $("#tickers-grid").append('<div class="empty-state"><b>Build your watchlist</b>Add a stock symbol above to see live pricing and forecasts.</div>');
         }
@@ -381,7 +423,7 @@ function initMiddle() {
         window.location.href = "/predict/" + encodeURIComponent(stock);
     });
 
-    if (document.getElementById("counter")) {
+    if (!startPriceStream() && document.getElementById("counter")) {
         startUpdateCycle();
     }
 }
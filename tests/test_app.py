@@ -1,13 +1,33 @@
+import tempfile
+import time
 import unittest
 from unittest.mock import patch
 
-from RT_price import app, quote_cache
+import requests
+
+from chart_render import ChartRequestError
+from RT_price import (
+    app,
+    fragment_cache,
+    get_prediction_from_service,
+    prediction_breaker,
+    quote_cache,
+    quote_refresher,
+    remote_prediction_cache,
+    warm_up_worker,
+    worker_ready,
+)
+from shared_cache import SQLiteCache
+from ttl_cache import TTLCache
 
 
 class AppTests(unittest.TestCase):
     def setUp(self):
         app.config.update(TESTING=True)
         quote_cache.clear()
+        fragment_cache.clear()
+        remote_prediction_cache.clear()
+        prediction_breaker.record_success()
         self.client = app.test_client()
 
     def test_health(self):
@@ -16,13 +36,65 @@ class AppTests(unittest.TestCase):
         self.assertEqual(response.json, {"status": "ok"})
         self.assertEqual(response.headers["X-Content-Type-Options"], "nosniff")
 
+    @patch("RT_price.WARMUP_SYMBOLS", ["AAPL"])
+    @patch("RT_price.get_stock_quotes", return_value=({"AAPL": {"open": 1.0, "close": 2.0}}, {}))
+    @patch("RT_price.http_client.prime")
+    def test_health_reports_warming_until_worker_is_warm(self, prime_mock, quotes_mock):
+        worker_ready.clear()
+        try:
+            response = self.client.get("/health")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.json, {"status": "warming"})
+
+            warm_up_worker()
+        finally:
+            worker_ready.set()
+        self.assertEqual(self.client.get("/health").status_code, 200)
+        self.assertTrue(prime_mock.called)
+        quotes_mock.assert_called_once_with(["AAPL"])
+        self.assertEqual(response.headers["X-Content-Type-Options"], "nosniff", "503 warming responses keep security headers")
+
+    @patch("RT_price.WARMUP_SYMBOLS", ["AAPL"])
+    @patch("RT_price.get_chart_renderer", side_effect=RuntimeError("no chart backend"))
+    @patch("RT_price.get_stock_quotes", return_value=({"AAPL": {"open": 1.0, "close": 2.0}}, {}))
+    @patch("RT_price.http_client.prime")
+    def test_chart_warm_up_failure_does_not_skip_quote_warm_up(self, prime_mock, quotes_mock, _renderer_mock):
+        worker_ready.clear()
+        with self.assertLogs("RT_price", level="ERROR"):
+            warm_up_worker()
+        self.assertTrue(worker_ready.is_set())
+        self.assertTrue(prime_mock.called)
+        quotes_mock.assert_called_once_with(["AAPL"])
+
+    @patch("RT_price.get_chart_renderer")
+    def test_chart_image_route(self, renderer_mock):
+        renderer_mock.return_value.render.return_value = b"\x89PNG chart"
+
+        response = self.client.get("/chart/aapl.png?range=1y")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "image/png")
+        self.assertEqual(response.data, b"\x89PNG chart")
+        renderer_mock.return_value.render.assert_called_once_with("AAPL", "1y", "png")
+        cached = self.client.get("/chart/aapl.png?range=1y", headers={"If-None-Match": response.headers["ETag"]})
+        self.assertEqual(cached.status_code, 304)
+
+        renderer_mock.return_value.render.side_effect = ChartRequestError("Unsupported period: soon")
+        self.assertEqual(self.client.get("/chart/AAPL.svg?range=soon").status_code, 400)
+        renderer_mock.return_value.render.side_effect = ValueError("zero-size array to reduction operation")
+        with self.assertLogs("RT_price", level="ERROR"):
+            response = self.client.get("/chart/AAPL.svg?range=1y")
+        self.assertEqual(response.status_code, 500)
+        self.assertNotIn("zero-size", response.get_data(as_text=True))
+        self.assertEqual(self.client.get("/chart/AAPL.gif").status_code, 404)
+
     def test_invalid_tickers_are_rejected(self):
         for ticker in ("", "<script>", "A" * 16):
             with self.subTest(ticker=ticker):
                 response = self.client.post("/get_stock_data", json={"ticker": ticker})
                 self.assertEqual(response.status_code, 400)
 
-    @patch("RT_price.requests.get")
+    @patch("RT_price.http_client.get")
     def test_stock_data_success(self, get_mock):
         get_mock.return_value.json.return_value = {"open": "100.0", "close": "102.5"}
         response = self.client.post("/get_stock_data", json={"ticker": "aapl"})
@@ -30,12 +102,150 @@ class AppTests(unittest.TestCase):
         self.assertEqual(response.json, {"currentPrice": 102.5, "openPrice": 100.0})
         self.assertEqual(get_mock.call_args.kwargs["params"]["symbol"], "AAPL")
 
+    @patch("RT_price.http_client.get")
+    def test_batch_quotes_fetch_misses_in_one_request(self, get_mock):
+        get_mock.return_value.json.return_value = {
+            "MSFT": {"open": "400", "close": "410"},
+            "NOPE": {"code": 404, "status": "error", "message": "symbol not found"},
+        }
+        quote_cache.set("AAPL", {"currentPrice": 1.0, "openPrice": 1.0})
+
+        response = self.client.post("/quotes", json={"symbols": ["aapl", "MSFT", "nope", "msft"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["quotes"]["AAPL"], {"currentPrice": 1.0, "openPrice": 1.0})
+        self.assertEqual(response.json["quotes"]["MSFT"], {"currentPrice": 410.0, "openPrice": 400.0})
+        self.assertIn("NOPE", response.json["errors"])
+        get_mock.assert_called_once()
+        self.assertEqual(get_mock.call_args.kwargs["params"]["symbol"], "MSFT,NOPE")
+
+    def test_batch_quotes_validate_symbols(self):
+        for body in ({}, {"symbols": []}, {"symbols": "AAPL"}, {"symbols": ["<script>"]}, {"symbols": ["A"] * 51}):
+            with self.subTest(body=body):
+                response = self.client.post("/quotes", json=body)
+                self.assertEqual(response.status_code, 400)
+
+    @patch("RT_price._refresh_in_background")
+    @patch("RT_price.http_client.get")
+    def test_expired_quote_is_served_stale_while_refreshing(self, get_mock, refresh_mock):
+        stale_cache = TTLCache(maxsize=10, ttl=60, stale_ttl=300)
+        stale_cache.set("AAPL", {"currentPrice": 102.5, "openPrice": 100.0}, ttl=-1)
+
+        with patch("RT_price.quote_cache", stale_cache), patch("RT_price.QUOTE_MAX_STALE_SECONDS", 300):
+            response = self.client.post("/get_stock_data", json={"ticker": "AAPL"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"currentPrice": 102.5, "openPrice": 100.0, "stale": True})
+        refresh_mock.assert_called_once_with(["AAPL"])
+        get_mock.assert_not_called()
+
+    @patch("RT_price.http_client.get")
+    def test_refresh_ahead_fetches_upstream_despite_shared_entry(self, get_mock):
+        get_mock.return_value.json.return_value = {"open": "100.0", "close": "103.0"}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            shared = SQLiteCache(f"{tmpdir}/cache.sqlite3")
+            shared.set("quote:AAPL", {"currentPrice": 102.5, "openPrice": 100.0}, ttl=5)
+            quote_cache.set("AAPL", {"currentPrice": 102.5, "openPrice": 100.0}, ttl=5)
+
+            with patch("RT_price.get_shared_cache", return_value=shared):
+                quote_refresher.refresh(["AAPL"])
+            refreshed = shared.get("quote:AAPL")
+
+        get_mock.assert_called_once()
+        self.assertEqual(quote_cache.get("AAPL"), {"currentPrice": 103.0, "openPrice": 100.0})
+        self.assertGreater(quote_cache.expires_in("AAPL"), 30)
+        self.assertEqual(refreshed[0]["currentPrice"], 103.0)
+
+    @patch("RT_price.fetch_news", side_effect=lambda ticker: time.sleep(1) or [])
+    @patch("RT_price.event", side_effect=RuntimeError("metrics unavailable"))
+    @patch("RT_price.summary", return_value={"Company": "Apple Inc"})
+    def test_detail_page_renders_lookups_that_meet_the_deadline(self, _summary, _event, _news):
+        started = time.monotonic()
+        with patch("RT_price.PAGE_DEADLINE_SECONDS", 0.2):
+            response = self.client.get("/predict/AAPL")
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(response.status_code, 200)
+        page = response.get_data(as_text=True)
+        self.assertIn("Apple Inc", page)
+        self.assertIn("Key statistics are currently unavailable.", page)
+        self.assertIn("No recent stories found.", page)
+
+    @patch("RT_price.fetch_news", return_value=[{"title": "Apple update", "url": "https://example.com"}])
+    @patch("RT_price.event", return_value={"Beta": 1.2})
+    @patch("RT_price.summary", return_value={"Company": "Apple Inc"})
+    def test_detail_page_fragments_are_cached_and_support_etags(self, summary_mock, event_mock, news_mock):
+        first = self.client.get("/predict/AAPL")
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Apple update", first.get_data(as_text=True))
+        etag = first.headers["ETag"]
+
+        second = self.client.get("/predict/AAPL")
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(summary_mock.call_count + event_mock.call_count + news_mock.call_count, 3)
+
+        not_modified = self.client.get("/predict/AAPL", headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.get_data(), b"")
+
+        fragment_cache.clear()
+        news_mock.return_value = [{"title": "Apple earnings", "url": "https://example.com/2"}]
+        changed = self.client.get("/predict/AAPL", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
     @patch("RT_price.get_prediction_from_service", return_value=([1, 2], [3]))
     def test_prediction_success(self, _prediction_mock):
         response = self.client.post("/predict", json={"ticker": "MSFT"})
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json["predicted_next_close"], 3.0)
 
+    @patch("RT_price.PREDICTION_MODE", "remote")
+    @patch("RT_price.PREDICTION_API_URL", "https://ml.example.com")
+    @patch("RT_price.http_client.post")
+    def test_remote_predictions_are_reused(self, post_mock):
+        post_mock.return_value.ok = True
+        post_mock.return_value.status_code = 200
+        post_mock.return_value.json.return_value = {"actual_prices": [1.0, 2.0], "predicted_prices": [3.0]}
+
+        self.assertEqual(get_prediction_from_service("msft"), ([1.0, 2.0], [3.0]))
+        self.assertEqual(get_prediction_from_service("MSFT"), ([1.0, 2.0], [3.0]))
+        self.assertEqual(post_mock.call_count, 1)
+
+    @patch("RT_price.PREDICTION_MODE", "remote")
+    @patch("RT_price.PREDICTION_API_URL", "https://ml.example.com")
+    @patch("RT_price.http_client.post", side_effect=requests.Timeout("read timed out"))
+    def test_prediction_outage_opens_the_circuit(self, post_mock):
+        for _ in range(prediction_breaker.failure_threshold):
+            with self.assertRaisesRegex(RuntimeError, "request failed"):
+                get_prediction_from_service("MSFT")
+        with self.assertRaisesRegex(RuntimeError, "unavailable"):
+            get_prediction_from_service("MSFT")
+        self.assertEqual(post_mock.call_count, prediction_breaker.failure_threshold)
+
+    @patch("RT_price.PREDICTION_MODE", "remote")
+    @patch("RT_price.PREDICTION_API_URL", "https://ml.example.com")
+    @patch("RT_price.http_client.post")
+    def test_batch_predictions_send_only_uncached_tickers(self, post_mock):
+        remote_prediction_cache.set("AAPL", ([1.0], [2.0]))
+        post_mock.return_value.ok = True
+        post_mock.return_value.status_code = 200
+        post_mock.return_value.json.return_value = {
+            "results": {"MSFT": {"actual_prices": [3.0], "predicted_prices": [4.0]}},
+            "errors": {"BAD": "Not enough data to predict"},
+        }
+
+        response = self.client.post("/predictions", json={"tickers": ["aapl", "MSFT", "BAD"]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(post_mock.call_args.kwargs["json"], {"tickers": ["MSFT", "BAD"]})
+        self.assertEqual(response.json["results"]["AAPL"]["predicted_next_close"], 2.0)
+        self.assertEqual(response.json["results"]["MSFT"]["actual_prices"], [3.0])
+        self.assertEqual(response.json["errors"], {"BAD": "Not enough data to predict"})
+
+    def test_batch_predictions_validate_tickers(self):
+        self.assertEqual(self.client.post("/predictions", json={"tickers": []}).status_code, 400)
+        self.assertEqual(self.client.post("/predictions", json={"tickers": ["BAD TICKER"]}).status_code, 400)
+
 
 if __name__ == "__main__":
     unittest.main()
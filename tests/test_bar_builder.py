@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from bar_builder import BarBuilder
+
+START = np.datetime64("2024-04-22T09:30:00", "ms")
+
+
+def at(seconds):
+    return START + np.timedelta64(int(seconds * 1000), "ms")
+
+
+class BarBuilderTests(unittest.TestCase):
+    def test_ticks_build_ohlcv_bars(self):
+        builder = BarBuilder(interval_seconds=60, sma_windows=(2,))
+        self.assertFalse(builder.add(at(1), 10.0, 5))
+        builder.add(at(20), 12.0, 5)
+        builder.add(at(40), 9.0, 5)
+        self.assertTrue(builder.add(at(61), 11.0, 7))
+
+        (bar,) = builder.completed()
+        self.assertEqual(bar["time"], START)
+        self.assertEqual((bar["open"], bar["high"], bar["low"], bar["close"]), (10.0, 12.0, 9.0, 9.0))
+        self.assertEqual((bar["volume"], bar["ticks"]), (15.0, 3))
+        self.assertEqual(builder.current["close"][0], 11.0)
+        self.assertEqual(len(builder.bars()), 2)
+
+    def test_running_smas_match_full_recomputation(self):
+        closes = [float(value) for value in np.random.default_rng(0).normal(100, 2, 40)]
+        builder = BarBuilder(interval_seconds=60, sma_windows=(5, 20), capacity=100)
+        for minute, close in enumerate(closes):
+            builder.add(at(minute * 60), close)
+
+        bars = builder.bars()
+        for window in (5, 20):
+            expected = [np.nan] * (window - 1) + [np.mean(closes[i - window + 1: i + 1]) for i in range(window - 1, 40)]
+            np.testing.assert_allclose(bars[f"sma{window}"], expected, rtol=1e-12)
+
+    def test_keeps_only_the_newest_completed_bars(self):
+        builder = BarBuilder(interval_seconds=60, sma_windows=(3,), capacity=3)
+        for minute in range(6):
+            builder.add(at(minute * 60), float(minute))
+        self.assertEqual(builder.completed()["close"].tolist(), [2.0, 3.0, 4.0])
+        self.assertAlmostEqual(builder.completed()["sma3"][-1], 3.0)
+        # A late tick is folded into the current bar instead of reopening a completed one.
+        builder.add(at(30), 9.0)
+        self.assertEqual(builder.current["high"][0], 9.0)
+        self.assertEqual(len(builder), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+from candle_artists import CandleArtists
+
+
+class CandleArtistsTests(unittest.TestCase):
+    def setUp(self):
+        self.fig, self.ax = plt.subplots()
+        self.candles = CandleArtists(self.ax, capacity=3)
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def test_only_changed_candles_are_updated(self):
+        changed = self.candles.update([10, 11], [12, 13], [9, 10], [11, 10])
+        self.assertEqual(list(changed), [0, 1])
+        self.assertEqual(self.candles.bodies[0].get_y(), 10)
+        self.assertEqual(self.candles.bodies[0].get_height(), 1)
+        self.assertEqual(list(self.candles.wicks[1].get_ydata()), [10, 13])
+        self.assertNotEqual(self.candles.bodies[0].get_facecolor(), self.candles.bodies[1].get_facecolor())
+
+        changed = self.candles.update([10, 11], [12, 14], [9, 10], [11, 14])
+        self.assertEqual(list(changed), [1])
+        self.assertEqual(self.candles.bodies[1].get_height(), 3)
+
+    def test_artists_are_reused_and_extra_slots_hidden(self):
+        patches = len(self.ax.patches)
+        self.candles.update([1, 2, 3, 4], [2, 3, 4, 5], [0, 1, 2, 3], [2, 3, 4, 5])
+        self.assertEqual(self.candles.count, 3)
+        self.assertEqual(self.candles.bodies[0].get_y(), 2)
+
+        self.candles.update([1], [2], [0], [2])
+        self.assertEqual(len(self.ax.patches), patches)
+        self.assertEqual(len(self.candles.artists), 2)
+        self.assertFalse(self.candles.bodies[1].get_visible())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import threading
+import unittest
+
+import numpy as np
+
+from chart_render import ChartRenderer, ChartRequestError, FigurePool, group_bars, moving_averages
+
+
+def history(rows, last_day=20000):
+    closes = np.linspace(10, 20, rows, dtype=np.float32)
+    return {
+        "date": np.arange(last_day - rows + 1, last_day + 1, dtype=np.int64),
+        "open": closes - 0.5,
+        "high": closes + 1,
+        "low": closes - 1,
+        "close": closes,
+        "volume": np.full(rows, 100, dtype=np.int64),
+    }
+
+
+class FakeStore:
+    def __init__(self, columns):
+        self.columns = columns
+        self.calls = 0
+
+    def update(self, ticker, period):
+        self.calls += 1
+        return self.columns
+
+
+class ChartHelpersTests(unittest.TestCase):
+    def test_moving_averages_are_nan_until_the_window_is_full(self):
+        averages = moving_averages([1, 2, 3, 4], [2, 5])
+        np.testing.assert_allclose(averages[2], [np.nan, 1.5, 2.5, 3.5])
+        self.assertTrue(np.isnan(averages[5]).all())
+
+    def test_group_bars_merges_consecutive_bars(self):
+        columns = {name: values for name, values in history(5).items() if name != "volume"}
+        grouped = group_bars(columns, max_candles=2)
+        self.assertEqual(len(grouped["close"]), 2)
+        self.assertEqual(grouped["open"][0], columns["open"][0])
+        self.assertEqual(grouped["close"][0], columns["close"][2])
+        self.assertEqual(grouped["high"][1], columns["high"][4])
+        self.assertEqual(grouped["date"][1], columns["date"][4])
+
+
+class ChartRendererTests(unittest.TestCase):
+    def setUp(self):
+        self.store = FakeStore(history(400))
+        self.renderer = ChartRenderer(store=self.store, sma_windows=(5, 20), max_candles=100)
+
+    def test_renders_png_and_svg(self):
+        png = self.renderer.render("AAPL", "3mo", "png")
+        svg = self.renderer.render("AAPL", "1y", "svg")
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        self.assertIn(b"<svg", svg)
+
+    def test_images_are_cached_until_a_new_bar_arrives(self):
+        first = self.renderer.render("AAPL", "6mo")
+        self.assertIs(self.renderer.render("AAPL", "6mo"), first)
+        self.store.columns = history(401, last_day=20001)
+        self.assertIsNot(self.renderer.render("AAPL", "6mo"), first)
+        self.assertEqual(self.renderer.pool._created, 1)
+
+    def test_rejects_unknown_formats_and_ranges(self):
+        for args in (("AAPL", "6mo", "gif"), ("AAPL", "10y"), ("AAPL", "soon"), ("AAPL", "0d")):
+            with self.subTest(args=args), self.assertRaises(ChartRequestError):
+                self.renderer.render(*args)
+        self.assertEqual(self.store.calls, 0)
+
+    def test_rejects_empty_history(self):
+        self.store.columns = history(0)
+        with self.assertRaisesRegex(ChartRequestError, "No price history"):
+            self.renderer.render("AAPL", "1y")
+
+
+class FigurePoolTests(unittest.TestCase):
+    def test_reuses_figures_and_fails_when_all_are_busy(self):
+        pool = FigurePool(factory=object, size=1, wait=0.01)
+        with pool.figure() as first:
+            errors = []
+
+            def borrow():
+                try:
+                    with pool.figure():
+                        pass
+                except RuntimeError as exc:
+                    errors.append(exc)
+
+            thread = threading.Thread(target=borrow)
+            thread.start()
+            thread.join()
+            self.assertEqual(len(errors), 1)
+        with pool.figure() as second:
+            self.assertIs(second, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
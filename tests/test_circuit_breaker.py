@@ -0,0 +1,65 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from circuit_breaker import Bulkhead, CircuitBreaker, CircuitOpenError
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_after_consecutive_failures_and_fails_fast(self):
+        breaker = CircuitBreaker("svc", failure_threshold=2, reset_timeout=30)
+        breaker.before_call()
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+        breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = CircuitBreaker("svc", failure_threshold=1, reset_timeout=30)
+        with patch("circuit_breaker.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+        with patch("circuit_breaker.time.monotonic", return_value=131.0):
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            breaker.before_call()
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_call()
+            breaker.record_failure()
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_call()
+        with patch("circuit_breaker.time.monotonic", return_value=162.0):
+            breaker.before_call()
+            breaker.record_success()
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class BulkheadTests(unittest.TestCase):
+    def test_refuses_calls_beyond_the_limit(self):
+        bulkhead = Bulkhead("svc", limit=1)
+        entered, release = threading.Event(), threading.Event()
+
+        def hold():
+            with bulkhead:
+                entered.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        entered.wait(5)
+        with self.assertRaisesRegex(RuntimeError, "Too many concurrent calls"):
+            with bulkhead:
+                pass
+        release.set()
+        thread.join()
+        with bulkhead:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from columnar import convert_yfinance_csv, open_table, read_header, write_table
+
+YFINANCE_CSV = """Price,Close,High,Low,Open,Volume
+Ticker,SHOP,SHOP,SHOP,SHOP,SHOP
+Date,,,,,
+2015-05-20,1.70,1.75,1.65,1.68,100
+2015-05-21,2.56,2.87,2.41,2.79,123039000
+2015-05-22,,,,,
+"""
+
+
+class ColumnarTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_returns_aligned_memory_mapped_views(self):
+        path = os.path.join(self.tmpdir.name, "table.ohlcv")
+        close = np.linspace(1, 2, 1000, dtype=np.float32)
+        write_table(path, {"date": np.arange(1000, dtype=np.int64), "close": close}, meta={"ticker": "AAPL"})
+
+        columns, meta = open_table(path)
+        np.testing.assert_array_equal(columns["close"], close)
+        self.assertEqual(meta, {"ticker": "AAPL"})
+        self.assertIsInstance(columns["close"].base, np.memmap)
+        self.assertFalse(columns["close"].flags.writeable)
+        self.assertEqual(read_header(path)["columns"]["close"]["offset"] % 64, 0)
+
+    def test_mismatched_column_lengths_are_rejected(self):
+        with self.assertRaises(ValueError):
+            write_table(os.path.join(self.tmpdir.name, "bad"), {"a": np.zeros(2), "b": np.zeros(3)})
+
+    def test_yfinance_csv_conversion(self):
+        csv_path = os.path.join(self.tmpdir.name, "SHOP_data.csv")
+        with open(csv_path, "w", encoding="utf-8") as handle:
+            handle.write(YFINANCE_CSV)
+
+        columns, meta = open_table(convert_yfinance_csv(csv_path))
+        self.assertEqual(meta["ticker"], "SHOP")
+        np.testing.assert_allclose(columns["close"], [1.70, 2.56], rtol=1e-6)
+        self.assertEqual(columns["volume"].tolist(), [100, 123039000])
+        self.assertEqual(str(np.datetime64(int(columns["date"][0]), "D")), "2015-05-20")
+
+
+if __name__ == "__main__":
+    unittest.main()
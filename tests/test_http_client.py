@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import DEFAULT, patch
+
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+import http_client
+
+
+class HttpClientTests(unittest.TestCase):
+    def setUp(self):
+        http_client._sessions.clear()
+
+    def test_sessions_are_reused_per_host(self):
+        first = http_client.get_session("https://api.twelvedata.com/quote")
+        self.assertIs(first, http_client.get_session("https://api.twelvedata.com/time_series"))
+        self.assertIsNot(first, http_client.get_session("https://finnhub.io/api/v1"))
+
+    def test_new_process_gets_new_sessions(self):
+        first = http_client.get_session("https://finnhub.io/api/v1")
+        with patch("http_client.os.getpid", return_value=-1):
+            self.assertIsNot(first, http_client.get_session("https://finnhub.io/api/v1"))
+
+    def test_pool_size_and_retries_follow_configuration(self):
+        with patch.dict(http_client.HTTP_POOL_SIZES, {"finnhub.io": 3}):
+            adapter = http_client.get_session("https://finnhub.io/api/v1").get_adapter("https://finnhub.io/")
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertEqual(adapter.max_retries.total, http_client.HTTP_RETRIES)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+        self.assertEqual(http_client._parse_pool_sizes("a.com=5, bad, b.com=x"), {"a.com": 5})
+
+    def test_reset_sockets_are_retried_but_read_timeouts_are_not(self):
+        retry = http_client.get_session("https://finnhub.io/api/v1").get_adapter("https://finnhub.io/").max_retries
+        reset = ProtocolError("Connection aborted.", ConnectionResetError(104, "Connection reset by peer"))
+        self.assertEqual(retry.increment(method="GET", url="/quote", error=reset).total, http_client.HTTP_RETRIES - 1)
+        with self.assertRaises(ReadTimeoutError):
+            retry.increment(method="GET", url="/quote", error=ReadTimeoutError(None, "/quote", "Read timed out."))
+
+    def test_prime_opens_connections_and_ignores_failures(self):
+        with patch("requests.Session.head", side_effect=[http_client.requests.ConnectionError("down"), DEFAULT]) as head_mock:
+            http_client.prime(["https://finnhub.io/api/v1", "https://api.twelvedata.com/quote"])
+        self.assertEqual(head_mock.call_count, 2)
+
+    def test_numeric_timeout_becomes_connect_and_read_timeouts(self):
+        with patch("requests.Session.get") as get_mock:
+            http_client.get("https://finnhub.io/api/v1/quote", timeout=10)
+        self.assertEqual(get_mock.call_args.kwargs["timeout"], (http_client.HTTP_CONNECT_TIMEOUT_SECONDS, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
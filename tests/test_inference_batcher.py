@@ -0,0 +1,49 @@
+import threading
+import unittest
+from concurrent.futures import Future
+
+import numpy as np
+
+from inference_batcher import InferenceBatcher
+
+
+class InferenceBatcherTests(unittest.TestCase):
+    def test_concurrent_windows_share_one_model_call(self):
+        calls = []
+        batcher = InferenceBatcher(lambda x: calls.append(x.shape) or x[:, -1, :] * 2, max_batch=8, max_wait=0.5)
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def worker(i):
+            barrier.wait()
+            results[i] = batcher.predict(np.full((1, 60, 1), i, dtype=np.float32), timeout=5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(len(calls), 2)
+        self.assertEqual(sum(shape[0] for shape in calls), 4)
+        for i in range(4):
+            self.assertEqual(results[i].tolist(), [[2.0 * i]])
+
+    def test_full_batch_is_not_delayed(self):
+        batcher = InferenceBatcher(lambda x: x.sum(axis=(1, 2)), max_batch=2, max_wait=60)
+        self.assertEqual(batcher.predict(np.ones((2, 3, 1)), timeout=5).tolist(), [3.0, 3.0])
+
+    def test_model_error_fails_every_caller_in_the_batch(self):
+        def broken(_x):
+            raise RuntimeError("model unavailable")
+
+        batcher = InferenceBatcher(broken)
+        pending = [(np.zeros((1, 60, 1)), Future()), (np.zeros((1, 60, 1)), Future())]
+        batcher.run_batch(pending)
+        for _, future in pending:
+            with self.assertRaisesRegex(RuntimeError, "model unavailable"):
+                future.result(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
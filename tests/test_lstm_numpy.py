@@ -0,0 +1,59 @@
+import importlib.util
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from lstm_numpy import LSTMLayer, NumpySequentialModel
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "stoc.h5")
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+class NumpyLSTMTests(unittest.TestCase):
+    def test_single_unit_matches_the_lstm_equations(self):
+        # Gates in Keras order: input, forget, cell, output.
+        w, u, b = [0.5, -0.3, 0.8, 0.2], [0.1, 0.4, -0.6, 0.3], [0.0, 1.0, 0.1, -0.2]
+        layer = LSTMLayer(np.array([w]), np.array([u]), np.array(b))
+        h = c = 0.0
+        for x in (0.2, 0.7, -0.4):
+            z = [x * w[k] + h * u[k] + b[k] for k in range(4)]
+            c = _sigmoid(z[1]) * c + _sigmoid(z[0]) * math.tanh(z[2])
+            h = _sigmoid(z[3]) * math.tanh(c)
+        output = layer(np.array([[[0.2], [0.7], [-0.4]]], dtype=np.float32))
+        self.assertAlmostEqual(float(output[0, 0]), h, places=6)
+
+    def test_batched_forward_pass_matches_one_window_at_a_time(self):
+        model = NumpySequentialModel.from_h5(MODEL_PATH)
+        windows = np.random.default_rng(0).random((5, 60, 1), dtype=np.float32)
+        batched = model.predict(windows)
+        self.assertEqual(batched.shape, (5, 1))
+        for i in range(5):
+            np.testing.assert_allclose(model.predict(windows[i: i + 1]), batched[i: i + 1], rtol=1e-5)
+
+    def test_npz_conversion_round_trips_the_model(self):
+        model = NumpySequentialModel.from_h5(MODEL_PATH)
+        windows = np.random.default_rng(2).random((3, 60, 1), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "stoc.npz")
+            model.save_npz(path)
+            converted = NumpySequentialModel.load(path)
+        np.testing.assert_array_equal(converted.predict(windows), model.predict(windows))
+        self.assertEqual([layer.config for layer in converted.layers], [layer.config for layer in model.layers])
+
+    @unittest.skipUnless(importlib.util.find_spec("tensorflow"), "TensorFlow is not installed")
+    def test_matches_keras(self):
+        from tensorflow.keras.models import load_model
+
+        windows = np.random.default_rng(1).random((8, 60, 1), dtype=np.float32)
+        expected = load_model(MODEL_PATH, compile=False).predict(windows, verbose=0)
+        np.testing.assert_allclose(NumpySequentialModel.from_h5(MODEL_PATH).predict(windows), expected, rtol=1e-4, atol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,7 @@ class FinnhubTests(unittest.TestCase):
     def setUp(self):
         web_scrapping.finnhub_cache.clear()
 
-    @patch("web_scrapping.requests.get")
+    @patch("web_scrapping.http_client.get")
     def test_profile_uses_finnhub(self, get_mock):
         get_mock.return_value.json.return_value = {
             "name": "Apple Inc", "finnhubIndustry": "Technology", "exchange": "NASDAQ",
@@ -19,7 +19,7 @@ class FinnhubTests(unittest.TestCase):
         self.assertEqual(profile["Market Capitalization"], "$3,000,000M")
         self.assertIn("stock/profile2", get_mock.call_args.args[0])
 
-    @patch("web_scrapping.requests.get")
+    @patch("web_scrapping.http_client.get")
     def test_news_uses_finnhub(self, get_mock):
         get_mock.return_value.json.return_value = [{"headline": "Apple update", "url": "https://example.com"}]
         news = web_scrapping.data("AAPL")
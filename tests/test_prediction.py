@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import prediction
+from prediction_cache import PredictionCache
+from shared_cache import NullCache
+
+
+class MinMaxScaler:
+    """Stands in for sklearn's scaler, which is only installed in the ML images."""
+
+    def fit_transform(self, values):
+        self.low, self.high = float(values.min()), float(values.max())
+        return (values - self.low) / (self.high - self.low)
+
+    def inverse_transform(self, values):
+        return np.asarray(values) * (self.high - self.low) + self.low
+
+
+class FakeStore:
+    def __init__(self):
+        self.periods = []
+
+    def close_prices(self, ticker, min_rows=1, period="5y"):
+        self.periods.append(period)
+        if ticker == "BAD":
+            raise ValueError("Not enough data. Need at least 60 rows.")
+        return np.linspace(10, 20, 100, dtype=np.float32).reshape(-1, 1)
+
+    def last_bar(self, ticker, period="5y"):
+        if ticker == "BAD":
+            raise ValueError("No price data returned from yfinance for ticker BAD")
+        return "20000:20.0"
+
+
+class BatchPredictionTestCase(unittest.TestCase):
+    """Runs the real make_predictions against a fake store, an in-memory cache and a fake model."""
+
+    def setUp(self):
+        self.store = FakeStore()
+        self.cache = PredictionCache(NullCache())
+        for period in ("5y", "2y"):
+            self.cache.store("AAPL", "v1", "20000:20.0", ([1.0], [2.0]), period)
+        self.batches = []
+        for target, value in (
+            ("prediction.get_price_history_store", lambda: self.store),
+            ("prediction.get_prediction_cache", lambda: self.cache),
+            ("prediction.current_model_version", lambda: "v1"),
+            ("prediction._new_scaler", MinMaxScaler),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(prediction.inference_batcher, "predict", self.predict)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def predict(self, windows):
+        self.batches.append(len(windows))
+        return np.full((len(windows), 1), 0.5)
+
+
+class MakePredictionsTests(BatchPredictionTestCase):
+    def test_cached_uncached_and_failing_tickers(self):
+        results, errors = prediction.make_predictions(["aapl", "MSFT", "BAD", "MSFT"])
+
+        self.assertEqual(results["AAPL"], ([1.0], [2.0]))
+        self.assertEqual(results["MSFT"][1], [15.0])
+        self.assertEqual(len(results["MSFT"][0]), prediction.LOOKBACK)
+        self.assertIn("BAD", errors)
+        self.assertEqual(self.batches, [1])
+        self.assertEqual(self.cache.cached("MSFT", "v1"), results["MSFT"])
+
+    def test_model_failure_becomes_per_ticker_errors(self):
+        with patch.object(prediction.inference_batcher, "predict", side_effect=RuntimeError("model crashed")):
+            results, errors = prediction.make_predictions(["AAPL", "MSFT"])
+        self.assertEqual(list(results), ["AAPL"])
+        self.assertEqual(errors, {"MSFT": "model crashed"})
+
+    def test_path_like_tickers_are_refused(self):
+        results, errors = prediction.make_predictions(["../../etc/passwd", "MSFT"])
+        self.assertEqual(list(results), ["MSFT"])
+        self.assertIn("../../ETC/PASSWD", errors)
+        with self.assertRaises(ValueError):
+            prediction.make_prediction("../x")
+        self.assertEqual(self.store.periods, ["5y"])
+
+    def test_history_period_is_passed_through(self):
+        prediction.make_predictions(["MSFT"], period="2y")
+        self.assertEqual(self.store.periods, ["2y"])
+
+
+class PredictionServiceBatchTests(BatchPredictionTestCase):
+    def check(self, payload):
+        self.assertEqual(payload["results"]["AAPL"]["predicted_prices"], [2.0])
+        self.assertEqual(payload["results"]["MSFT"]["predicted_prices"], [15.0])
+        self.assertIn("BAD", payload["errors"])
+
+    def test_ml_service_batch(self):
+        from ml_service import app
+
+        response = app.test_client().post("/predict", json={"tickers": ["AAPL", "MSFT", "BAD"]})
+        self.assertEqual(response.status_code, 200)
+        self.check(response.json)
+
+    def test_lambda_handlers_accept_tickers(self):
+        import lambda_app
+        import lambda_predict
+
+        for handler in (lambda_predict.handler, lambda_app.handler):
+            with self.subTest(handler=handler.__module__):
+                response = handler({"body": json.dumps({"tickers": ["AAPL", "MSFT", "BAD"]})}, None)
+                self.assertEqual(response["statusCode"], 200)
+                self.check(json.loads(response["body"]))
+        self.assertEqual(lambda_predict.handler({"body": json.dumps({"tickers": []})}, None)["statusCode"], 400)
+        # The two deployments scale over different histories, so neither reuses the other's MSFT result.
+        self.assertEqual(self.store.periods, ["5y", "2y"])
+
+
+    def test_invalid_single_tickers_are_client_errors(self):
+        import lambda_app
+        import lambda_predict
+        from ml_service import app
+
+        self.assertEqual(app.test_client().post("/predict", json={"ticker": "../../x"}).status_code, 400)
+        for handler in (lambda_predict.handler, lambda_app.handler):
+            with self.subTest(handler=handler.__module__):
+                response = handler({"httpMethod": "POST", "body": json.dumps({"ticker": "../../x"})}, None)
+                self.assertEqual(response["statusCode"], 400)
+        self.assertEqual(self.store.periods, [])
+
+
+class ModelFileTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.h5 = os.path.join(self.tmpdir.name, "stoc.h5")
+        self.npz = os.path.join(self.tmpdir.name, "stoc.npz")
+        for path in (self.h5, self.npz):
+            with open(path, "wb") as handle:
+                handle.write(b"weights")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_npz_is_used_unless_the_h5_is_newer(self):
+        os.utime(self.h5, (1000, 1000))
+        os.utime(self.npz, (2000, 2000))
+        self.assertEqual(prediction.model_file(self.h5, self.npz), self.npz)
+
+        os.utime(self.h5, (3000, 3000))
+        with self.assertLogs("prediction", level="WARNING"):
+            self.assertEqual(prediction.model_file(self.h5, self.npz), self.h5)
+
+        with patch("prediction.PREDICTION_ENGINE", "keras"):
+            self.assertEqual(prediction.model_file(self.h5, self.npz), self.h5)
+
+    def test_cache_version_hashes_the_loaded_file(self):
+        with open(self.h5, "wb") as handle:
+            handle.write(b"retrained weights")
+        with patch("prediction.MODEL", object()), patch("prediction.MODEL_FILE", self.h5):
+            h5_version = prediction.current_model_version()
+        with patch("prediction.MODEL", object()), patch("prediction.MODEL_FILE", self.npz):
+            self.assertNotEqual(prediction.current_model_version(), h5_version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from prediction_cache import PredictionCache, model_version
+from shared_cache import SQLiteCache
+
+
+class PredictionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "predictions.sqlite3")
+        self.bar = 20000
+        self.computed = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def compute(self):
+        self.computed += 1
+        return [1.0, 2.0], [float(str(self.bar).split(":")[0])]
+
+    def predict(self, cache, version="v1"):
+        return cache.get_or_compute("AAPL", version, last_bar=lambda: self.bar, compute=self.compute)
+
+    def test_repeat_requests_skip_the_model_and_survive_a_restart(self):
+        cache = PredictionCache(SQLiteCache(self.path))
+        self.assertEqual(self.predict(cache), ([1.0, 2.0], [20000.0]))
+        self.predict(cache)
+        self.assertEqual(self.computed, 1)
+
+        restarted = PredictionCache(SQLiteCache(self.path))
+        self.assertEqual(self.predict(restarted), ([1.0, 2.0], [20000.0]))
+        self.assertEqual(self.computed, 1)
+
+    def test_new_bar_or_model_version_recomputes(self):
+        cache = PredictionCache(SQLiteCache(self.path), memory_ttl=0.001)
+        self.predict(cache)
+        self.bar = 20001
+        cache.clear()
+        self.assertEqual(self.predict(cache), ([1.0, 2.0], [20001.0]))
+        cache.clear()
+        self.predict(cache, version="v2")
+        self.assertEqual(self.computed, 3)
+
+    def test_final_close_replaces_an_intraday_prediction(self):
+        cache = PredictionCache(SQLiteCache(self.path))
+        self.bar = "20000:101.5"
+        self.predict(cache)
+        cache.clear()
+        self.bar = "20000:102.25"
+        self.predict(cache)
+        self.assertEqual(self.computed, 2)
+
+    def test_history_periods_do_not_share_results(self):
+        cache = PredictionCache(SQLiteCache(self.path))
+        self.predict(cache)
+        restarted = PredictionCache(SQLiteCache(self.path))
+        restarted.get_or_compute("AAPL", "v1", last_bar=lambda: self.bar, compute=self.compute, period="2y")
+        self.assertEqual(self.computed, 2)
+
+    def test_model_version_follows_file_contents(self):
+        model = os.path.join(self.tmpdir.name, "model.h5")
+        with open(model, "wb") as handle:
+            handle.write(b"weights-1")
+        first = model_version(model)
+        with open(model, "wb") as handle:
+            handle.write(b"weights-2 changed")
+        self.assertNotEqual(model_version(model), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from price_history import PriceHistoryStore, frame_to_columns
+
+
+def daily_frame(start, closes, multi_index=False):
+    index = pd.bdate_range(start, periods=len(closes))
+    frame = pd.DataFrame(
+        {"Close": closes, "High": closes, "Low": closes, "Open": closes, "Volume": [100] * len(closes)},
+        index=index,
+    )
+    if multi_index:
+        frame.columns = pd.MultiIndex.from_tuples([(name, "AAPL") for name in frame.columns], names=["Price", "Ticker"])
+    return frame
+
+
+class PriceHistoryStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.downloads = []
+        self.responses = []
+        self.store = PriceHistoryStore(self.tmpdir.name, refresh_seconds=3600, download=self.download)
+        today = pd.Timestamp.today().normalize()
+        self.start = today - pd.Timedelta(days=30)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def download(self, ticker, **params):
+        self.downloads.append(params)
+        return self.responses.pop(0)
+
+    def test_multi_index_frames_become_typed_columns(self):
+        columns = frame_to_columns(daily_frame(self.start, [1.0, 2.0, np.nan, 4.0], multi_index=True), "AAPL")
+        np.testing.assert_allclose(columns["close"], [1.0, 2.0, 4.0])
+        self.assertEqual(columns["close"].dtype, np.float32)
+        self.assertEqual(columns["date"].dtype, np.int64)
+
+    def test_fresh_history_is_read_from_disk(self):
+        self.responses.append(daily_frame(self.start, [1.0, 2.0, 3.0]))
+        first = self.store.close_prices("AAPL", period="3mo")
+        second = self.store.close_prices("AAPL", period="3mo")
+        np.testing.assert_allclose(first, second)
+        self.assertEqual(len(self.downloads), 1)
+
+    def test_stale_history_only_fetches_recent_bars(self):
+        self.responses.append(daily_frame(self.start, [1.0, 2.0, 3.0]))
+        self.store.update("AAPL", period="3mo")
+        # The last stored bar was intraday (3.0); the refetch overlaps from the bar before it.
+        self.responses.append(daily_frame(self.start + pd.offsets.BDay(1), [2.0, 3.5, 4.0]))
+        with patch("price_history.time.time", return_value=1e12):
+            history = self.store.update("AAPL", period="3mo")
+
+        self.assertIn("start", self.downloads[1])
+        np.testing.assert_allclose(history["close"], [1.0, 2.0, 3.5, 4.0])
+
+    def test_failed_top_up_serves_stored_history(self):
+        self.responses.append(daily_frame(self.start, [1.0, 2.0, 3.0]))
+        self.store.update("AAPL", period="3mo")
+        self.responses.append(pd.DataFrame())
+        with patch("price_history.time.time", return_value=1e12):
+            with self.assertLogs("price_history", level="WARNING"):
+                history = self.store.update("AAPL", period="3mo")
+            # The failure is remembered until the next refresh window.
+            self.store.update("AAPL", period="3mo")
+
+        np.testing.assert_allclose(history["close"], [1.0, 2.0, 3.0])
+        self.assertEqual(len(self.downloads), 2)
+
+    def test_failed_first_download_raises(self):
+        self.responses.append(pd.DataFrame())
+        with self.assertRaises(ValueError):
+            self.store.update("AAPL", period="3mo")
+
+    def test_last_bar_changes_when_the_same_day_closes_differently(self):
+        self.responses.append(daily_frame(self.start, [1.0, 2.0, 3.0]))
+        intraday = self.store.last_bar("AAPL", period="3mo")
+        self.responses.append(daily_frame(self.start + pd.offsets.BDay(1), [2.0, 3.5]))
+        with patch("price_history.time.time", return_value=1e12):
+            final = self.store.last_bar("AAPL", period="3mo")
+
+        self.assertEqual(intraday.split(":")[0], final.split(":")[0])
+        self.assertNotEqual(intraday, final)
+
+    def test_tickers_cannot_leave_the_history_directory(self):
+        for ticker in ("../../x", "a/b", ".hidden", ""):
+            with self.subTest(ticker=ticker), self.assertRaises(ValueError):
+                self.store.update(ticker, period="3mo")
+        self.assertEqual(self.downloads, [])
+        self.assertEqual(self.store.path("brk.b").name, "BRK.B.ohlcv")
+
+    def test_longer_period_triggers_backfill(self):
+        self.responses.append(daily_frame(self.start, [1.0, 2.0, 3.0]))
+        self.store.update("AAPL", period="3mo")
+        self.responses.append(daily_frame(self.start - pd.Timedelta(days=200), [0.5, 1.0, 2.0, 3.0]))
+        self.store.update("AAPL", period="1y")
+        self.store.update("AAPL", period="3mo")
+        self.assertEqual([params.get("period") for params in self.downloads], ["3mo", "1y"])
+
+    def test_readjusted_history_is_reloaded(self):
+        self.responses.append(daily_frame(self.start, [1.0, 2.0, 3.0]))
+        self.store.update("AAPL", period="3mo")
+        self.responses.append(daily_frame(self.start + pd.offsets.BDay(1), [1.0, 1.5, 2.0]))
+        self.responses.append(daily_frame(self.start, [0.5, 1.0, 1.5, 2.0]))
+        with patch("price_history.time.time", return_value=1e12):
+            history = self.store.update("AAPL", period="3mo")
+
+        self.assertEqual(len(self.downloads), 3)
+        np.testing.assert_allclose(history["close"], [0.5, 1.0, 1.5, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
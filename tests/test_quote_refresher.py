@@ -0,0 +1,41 @@
+import unittest
+
+from quote_refresher import HotSymbolRefresher
+
+
+class HotSymbolRefresherTests(unittest.TestCase):
+    def make_refresher(self, expiries, credits_per_minute=60):
+        self.refreshed = []
+        refresher = HotSymbolRefresher(
+            refresh=self.refreshed.append,
+            expires_in=expiries.get,
+            credits_per_minute=credits_per_minute,
+            max_symbols=2,
+            lead_seconds=5,
+        )
+        refresher.start = lambda: None  # drive run_once by hand
+        return refresher
+
+    def test_hottest_due_symbols_are_refreshed_within_budget(self):
+        refresher = self.make_refresher({"AAPL": 1.0, "MSFT": 2.0, "TSLA": 0.5})
+        refresher.record(["AAPL", "AAPL", "AAPL", "MSFT", "MSFT", "TSLA"])
+        start = refresher._last_tick
+
+        self.assertEqual(refresher.run_once(start + 1), ["AAPL"])
+        self.assertEqual(refresher.run_once(start + 1.5), [])
+        self.assertEqual(refresher.run_once(start + 3), ["AAPL", "MSFT"])
+        self.assertNotIn("TSLA", sum(self.refreshed, []))
+
+    def test_symbols_far_from_expiry_are_left_alone(self):
+        refresher = self.make_refresher({"AAPL": 50.0})
+        refresher.record(["AAPL", "GOOG"])
+        self.assertEqual(refresher.run_once(refresher._last_tick + 10), ["GOOG"])
+
+    def test_disabled_without_credit_budget(self):
+        refresher = self.make_refresher({}, credits_per_minute=0)
+        refresher.record(["AAPL"])
+        self.assertEqual(refresher.hot_symbols(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
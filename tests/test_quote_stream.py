@@ -0,0 +1,80 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from RT_price import app
+from quote_stream import QuoteBroadcaster
+
+
+class QuoteBroadcasterTests(unittest.TestCase):
+    def setUp(self):
+        self.prices = {"AAPL": 1.0, "MSFT": 2.0}
+        self.fetches = []
+
+        def fetch(symbols):
+            self.fetches.append(symbols)
+            return {symbol: {"currentPrice": self.prices[symbol]} for symbol in symbols}, {}
+
+        self.broadcaster = QuoteBroadcaster(fetch=fetch)
+        self.broadcaster.start = lambda: None  # drive run_once by hand
+
+    def test_one_fetch_serves_every_subscriber_and_only_changes_are_pushed(self):
+        first = self.broadcaster.subscribe(["AAPL"])
+        second = self.broadcaster.subscribe(["AAPL", "MSFT"])
+
+        self.broadcaster.run_once()
+        self.assertEqual(self.fetches, [["AAPL", "MSFT"]])
+        self.assertEqual(first.get(0), {"AAPL": {"currentPrice": 1.0}})
+        self.assertEqual(set(second.get(0)), {"AAPL", "MSFT"})
+
+        self.prices["MSFT"] = 2.5
+        self.broadcaster.run_once()
+        self.assertEqual(first.get(0), {})
+        self.assertEqual(second.get(0), {"MSFT": {"currentPrice": 2.5}})
+
+    def test_new_subscribers_get_the_latest_snapshot(self):
+        self.broadcaster.subscribe(["AAPL"])
+        self.broadcaster.run_once()
+        late = self.broadcaster.subscribe(["AAPL"])
+        self.assertEqual(late.get(0), {"AAPL": {"currentPrice": 1.0}})
+
+    def test_stream_route_pushes_quote_events(self):
+        app.config.update(TESTING=True)
+        client = app.test_client()
+        with patch("RT_price.quote_broadcaster", self.broadcaster), patch("RT_price.TWELVE_DATA_API_KEY", "test"):
+            response = client.get("/quotes/stream?symbols=aapl")
+            self.assertEqual(response.mimetype, "text/event-stream")
+            self.broadcaster.run_once()
+            chunks = iter(response.response)
+            self.assertTrue(next(chunks).startswith(b"retry:"))
+            event = next(chunks).decode()
+            response.close()
+
+        self.assertTrue(event.startswith("event: quotes\n"))
+        payload = json.loads(event.split("data: ", 1)[1])
+        self.assertEqual(payload, {"quotes": {"AAPL": {"currentPrice": 1.0}}})
+        self.assertEqual(self.broadcaster.subscriber_count(), 0)
+
+    def test_subscribers_are_capped(self):
+        self.assertIsNotNone(self.broadcaster.subscribe(["AAPL"], max_subscribers=1))
+        self.assertIsNone(self.broadcaster.subscribe(["MSFT"], max_subscribers=1))
+        self.assertEqual(self.broadcaster.subscriber_count(), 1)
+
+    def test_stream_route_refuses_when_full_and_releases_unread_streams(self):
+        client = app.test_client()
+        with patch("RT_price.quote_broadcaster", self.broadcaster), patch("RT_price.TWELVE_DATA_API_KEY", "test"), \
+                patch("RT_price.QUOTE_STREAM_MAX_CLIENTS", 1):
+            response = client.get("/quotes/stream?symbols=aapl")
+            self.assertEqual(client.get("/quotes/stream?symbols=msft").status_code, 503)
+            # Closed before the first chunk was read: the slot is still given back.
+            response.close()
+            self.assertEqual(self.broadcaster.subscriber_count(), 0)
+
+    def test_stream_route_validates_symbols(self):
+        client = app.test_client()
+        self.assertEqual(client.get("/quotes/stream").status_code, 400)
+        self.assertEqual(client.get("/quotes/stream?symbols=<script>").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import RT_price
+from shared_cache import NullCache, SQLiteCache, create_shared_cache
+
+
+class SharedCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_sqlite_entries_are_visible_to_other_instances(self):
+        writer, reader = SQLiteCache(self.path), SQLiteCache(self.path)
+        writer.set_many({"quote:AAPL": {"currentPrice": 1.5}, "quote:MSFT": {"currentPrice": 2.5}}, ttl=30)
+        writer.set("quote:OLD", {"currentPrice": 0.5}, ttl=-1)
+
+        found = reader.get_many(["quote:AAPL", "quote:MSFT", "quote:OLD", "quote:NONE"])
+        self.assertEqual(set(found), {"quote:AAPL", "quote:MSFT"})
+        value, ttl_left = found["quote:AAPL"]
+        self.assertEqual(value, {"currentPrice": 1.5})
+        self.assertTrue(0 < ttl_left <= 30)
+
+    def test_backend_is_selected_from_url(self):
+        self.assertIsInstance(create_shared_cache(""), NullCache)
+        self.assertIsInstance(create_shared_cache(f"sqlite:///{self.path}"), SQLiteCache)
+        with self.assertRaises(ValueError):
+            create_shared_cache("memcached://localhost")
+
+    @patch("RT_price.http_client.get")
+    def test_quotes_fetched_by_another_worker_skip_upstream(self, get_mock):
+        RT_price.quote_cache.clear()
+        cache = SQLiteCache(self.path)
+        cache.set("quote:AAPL", {"currentPrice": 3.0, "openPrice": 2.0}, ttl=30)
+
+        with patch("RT_price.TWELVE_DATA_API_KEY", "test"), patch("RT_price.get_shared_cache", return_value=cache):
+            self.assertEqual(RT_price.get_stock_quote("AAPL"), {"currentPrice": 3.0, "openPrice": 2.0})
+        get_mock.assert_not_called()
+        self.assertIn("AAPL", RT_price.quote_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import threading
+import unittest
+
+from singleflight import SingleFlight
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch(keys):
+            calls.append(list(keys))
+            started.set()
+            release.wait(2)
+            return {key: key.lower() for key in keys}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do_many(["AAPL"], fetch)["AAPL"].result()))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(2)
+        for thread in threads[1:]:
+            thread.start()
+        threading.Timer(0.05, release.set).start()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(results, ["aapl"] * 5)
+        self.assertEqual(calls, [["AAPL"]])
+        self.assertFalse(flight.in_flight("AAPL"))
+
+    def test_batch_only_fetches_keys_not_already_in_flight(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch(keys):
+            started.set()
+            release.wait(2)
+            return {key: 1 for key in keys}
+
+        leader = threading.Thread(target=lambda: flight.do_many(["AAPL"], slow_fetch))
+        leader.start()
+        started.wait(2)
+
+        fetched = []
+        threading.Timer(0.05, release.set).start()
+        futures = flight.do_many(["AAPL", "MSFT"], lambda keys: fetched.extend(keys) or {key: 2 for key in keys})
+        leader.join(2)
+
+        self.assertEqual(fetched, ["MSFT"])
+        self.assertEqual({key: future.result() for key, future in futures.items()}, {"AAPL": 1, "MSFT": 2})
+
+    def test_errors_are_shared_per_key(self):
+        flight = SingleFlight()
+        futures = flight.do_many(["A", "B"], lambda keys: {"A": 1, "B": RuntimeError("unavailable")})
+        self.assertEqual(futures["A"].result(), 1)
+        self.assertIsInstance(futures["B"].exception(), RuntimeError)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("C", fail)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tick_feed import CsvTailReader, WideTickFeed, parse_tick, parse_wide_row, to_number
+
+
+class CsvTailReaderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "stock_data.csv")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, text, mode="a"):
+        with open(self.path, mode, encoding="utf-8", newline="") as handle:
+            handle.write(text)
+
+    def test_returns_only_new_complete_rows(self):
+        self.assertEqual(CsvTailReader(self.path).read_rows(), [])
+        reader = CsvTailReader(self.path)
+        self.write('2024-04-22 09:30:01,70.55,+0.88,"5,888,072 ",up,82.70\r\n2024-04-22 09:30:02,70.6')
+        self.assertEqual(reader.read_rows(), [["2024-04-22 09:30:01", "70.55", "+0.88", "5,888,072 ", "up", "82.70"]])
+        self.assertEqual(reader.read_rows(), [])
+        self.write("1,+0.94,5888100,up,82.70\n")
+        self.assertEqual(reader.read_rows()[0][:2], ["2024-04-22 09:30:02", "70.61"])
+
+    def test_restarts_when_the_file_is_truncated(self):
+        reader = CsvTailReader(self.path)
+        self.write("a,1\nb,2\n")
+        reader.read_rows()
+        self.write("c,3\n", mode="w")
+        self.assertEqual(reader.read_rows(), [["c", "3"]])
+
+
+class TickParsingTests(unittest.TestCase):
+    def test_parse_tick_handles_scraped_numbers_and_missing_fields(self):
+        tick = parse_tick(["2024-04-22 09:30:01", "1,070.55", "+0.88", "5,888,072 ", "up", "82.70 "])
+        self.assertEqual(tick.price, 1070.55)
+        self.assertEqual(tick.volume, 5888072.0)
+        self.assertEqual(tick.time, np.datetime64("2024-04-22T09:30:01", "ms"))
+        self.assertIsNone(parse_tick(["2024-04-22 09:30:01", "", "+0.88", "1", "up", "2"]))
+        self.assertTrue(np.isnan(to_number("n/a")))
+
+    def test_parse_wide_row_splits_symbols_and_skips_empty_groups(self):
+        row = ["0", "2024-04-22 03:59:32", "Shop", "70.55", "+0.88", "(+1.26%)", "5,888,072 ", "69.67 ", "82.70 ",
+               "AMZN", "", "", "", "", "", ""]
+        time, quotes = parse_wide_row(row)
+        self.assertEqual(time, np.datetime64("2024-04-22T03:59:32", "ms"))
+        self.assertEqual(list(quotes), ["SHOP"])
+        self.assertEqual(quotes["SHOP"].percent, 1.26)
+        self.assertEqual(quotes["SHOP"].volume, 5888072.0)
+        self.assertIsNone(parse_wide_row(["0", ""]))
+
+
+class WideTickFeedTests(unittest.TestCase):
+    def test_rows_are_fanned_out_to_per_symbol_bars(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "stock data.csv")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write('0,2024-04-22 09:30:01,Shop,70.00,+0.10,(+0.1%),"1,000 ",69.9,80,AAPL,165.00,-1.00,(-0.6%),"500 ",166,199\n')
+                handle.write('0,2024-04-22 09:30:30,Shop,71.00,+1.10,(+1.6%),"1,250 ",69.9,80,AAPL,,,,,,\n')
+                handle.write('0,2024-04-22 09:31:02,Shop,70.50,+0.60,(+0.9%),"1,300 ",69.9,80\n')
+            feed = WideTickFeed(path, ["SHOP", "AAPL"])
+            self.assertEqual(feed.update(), 3)
+            self.assertEqual(feed.update(), 0)
+
+        shop = feed.bars["SHOP"].bars()
+        self.assertEqual(shop["close"].tolist(), [71.0, 70.5])
+        self.assertEqual(shop["volume"].tolist(), [250.0, 50.0])
+        self.assertEqual(len(feed.bars["AAPL"].bars()), 1)
+        self.assertEqual(feed.latest["AAPL"].change, -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
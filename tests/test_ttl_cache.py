@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch
+
+from ttl_cache import TTLCache
+
+
+class TTLCacheTests(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("A", 1)
+        cache.set("B", 2)
+        self.assertEqual(cache.get("A"), 1)
+        cache.set("C", 3)
+
+        self.assertIsNone(cache.get("B"))
+        self.assertEqual(cache.get("A"), 1)
+        self.assertEqual(cache.get("C"), 3)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    @patch("ttl_cache.time.monotonic")
+    def test_expired_entries_are_swept_before_live_ones(self, clock):
+        clock.return_value = 100.0
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("OLD", 1, ttl=1)
+        cache.set("LIVE", 2)
+        clock.return_value = 110.0
+        cache.set("NEW", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("LIVE"), 2)
+        stats = cache.stats()
+        self.assertEqual((stats["expirations"], stats["evictions"]), (1, 0))
+
+    @patch("ttl_cache.time.monotonic")
+    def test_stale_entries_are_served_until_max_staleness(self, clock):
+        clock.return_value = 100.0
+        cache = TTLCache(maxsize=2, ttl=10, stale_ttl=30)
+        cache.set("A", 1)
+
+        clock.return_value = 120.0
+        self.assertIsNone(cache.get("A"))
+        self.assertEqual(cache.lookup("A"), (1, True))
+
+        clock.return_value = 141.0
+        self.assertIsNone(cache.lookup("A"))
+        self.assertEqual(len(cache), 0)
+
+    def test_counters_and_byte_accounting(self):
+        cache = TTLCache(maxsize=10, ttl=60, max_bytes=1000)
+        cache.get("MISSING")
+        cache.set("A", {"currentPrice": 1.0, "openPrice": 1.0})
+        cache.get("A")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertGreater(stats["bytes"], 0)
+
+        for index in range(10):
+            cache.set(index, "x" * 200)
+        self.assertLessEqual(cache.stats()["bytes"], 1000)
+        cache.clear()
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
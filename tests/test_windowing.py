@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+
+from windowing import iter_training_batches, last_window, sliding_windows, training_pairs
+
+
+class WindowingTests(unittest.TestCase):
+    def setUp(self):
+        self.series = np.arange(100, dtype=np.float64).reshape(-1, 1)
+
+    def test_training_pairs_match_the_loop_they_replace(self):
+        x, y = training_pairs(self.series, 30)
+        expected_x = np.array([self.series[i - 30:i, 0] for i in range(30, 100)])
+        np.testing.assert_array_equal(x[..., 0], expected_x)
+        np.testing.assert_array_equal(y, self.series[30:, 0])
+        self.assertEqual(x.shape, (70, 30, 1))
+        self.assertTrue(np.shares_memory(x, self.series))
+
+    def test_last_window_is_the_model_input_shape(self):
+        np.testing.assert_array_equal(last_window(self.series, 60), self.series[-60:].reshape(1, 60, 1))
+        self.assertEqual(sliding_windows(np.arange(10), 4, step=3).shape, (3, 4, 1))
+        with self.assertRaises(ValueError):
+            last_window(self.series[:10], 60)
+
+    def test_streamed_batches_cover_the_series_across_chunks(self):
+        chunks = np.array_split(self.series, [7, 8, 50])
+        batches = list(iter_training_batches(chunks, 5, batch_size=16))
+        self.assertTrue(all(len(y) == 16 for _x, y in batches[:-1]))
+        x, y = training_pairs(self.series, 5)
+        np.testing.assert_array_equal(np.concatenate([b[0] for b in batches]), x)
+        np.testing.assert_array_equal(np.concatenate([b[1] for b in batches]), y)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Incremental ingestion of the scraper's tick CSVs for the live chart (RT_platform.py).
+
+``CsvTailReader`` returns only the rows appended since the previous call, and the
+parsed ticks go straight into a ``BarBuilder`` whose candle history is capped, so
+the work per frame depends on how many ticks arrived, not on the session length.
+``WideTickFeed`` does the same for the wide CSV that has every symbol on one row.
+"""
+import csv
+import os
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from bar_builder import BarBuilder
+
+
+class CsvTailReader:
+    """Read a growing CSV from the byte offset where the previous read stopped.
+
+    A trailing line without its newline is held back until it is complete. If the
+    file is replaced or truncated, reading starts over from the beginning.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset = 0
+        self._partial = b""
+        self._inode: Optional[int] = None
+
+    def read_rows(self) -> list[list[str]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._inode, self._offset, self._partial = stat.st_ino, 0, b""
+        if stat.st_size == self._offset:
+            return []
+
+        with open(self.path, "rb") as handle:
+            handle.seek(self._offset)
+            chunk = handle.read(stat.st_size - self._offset)
+        self._offset += len(chunk)
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        text = [line.decode("utf-8", "replace").rstrip("\r") for line in lines if line.strip()]
+        return list(csv.reader(text))
+
+
+def to_number(value: str) -> float:
+    """Parse scraped numbers such as ``"5,888,072 "`` or ``"+0.88"``; NaN when empty or invalid."""
+    try:
+        return float(value.replace(",", "").strip())
+    except (AttributeError, ValueError):
+        return float("nan")
+
+
+class Tick(NamedTuple):
+    time: np.datetime64
+    price: float
+    change: str
+    volume: float
+    pattern: str
+    target: float
+
+
+def parse_tick(row: list[str]) -> Optional[Tick]:
+    """Parse a ``time, price, change, volume, pattern, target`` row; None when any field is missing."""
+    if len(row) < 6 or not all(field.strip() for field in row[:6]):
+        return None
+    try:
+        time = np.datetime64(row[0].strip(), "ms")
+    except ValueError:
+        return None
+    tick = Tick(time, to_number(row[1]), row[2].strip(), to_number(row[3]), row[4].strip(), to_number(row[5]))
+    if np.isnan(tick.price) or np.isnan(tick.volume):
+        return None
+    return tick
+
+
+class SymbolQuote(NamedTuple):
+    price: float
+    change: float
+    percent: float
+    volume: float  # cumulative for the day
+    previous_close: float
+    target: float
+
+
+WIDE_GROUP_SIZE = 7
+
+
+def parse_wide_row(row: list[str]) -> Optional[tuple[np.datetime64, dict[str, SymbolQuote]]]:
+    """Parse a ``0, time`` row followed by ``name, price, change, (percent), volume, previous close, target``
+    for each symbol; symbols without a price are left out. None when the time is missing."""
+    if len(row) < 2:
+        return None
+    try:
+        time = np.datetime64(row[1].strip(), "ms")
+    except ValueError:
+        return None
+    if np.isnat(time):
+        return None
+
+    quotes = {}
+    for start in range(2, len(row) - 1, WIDE_GROUP_SIZE):
+        group = row[start: start + WIDE_GROUP_SIZE] + [""] * WIDE_GROUP_SIZE
+        name, price = group[0].strip().upper(), to_number(group[1])
+        if not name or np.isnan(price):
+            continue
+        quotes[name] = SymbolQuote(
+            price, to_number(group[2]), to_number(group[3].strip("()% ")), to_number(group[4]),
+            to_number(group[5]), to_number(group[6]),
+        )
+    return time, quotes
+
+
+class WideTickFeed:
+    """Per-symbol bars from the wide CSV, reading and parsing each new row once.
+
+    Every row is fanned out to one BarBuilder per watched symbol. The CSV carries the
+    day's cumulative volume, so each bar gets the volume traded since the previous row.
+    """
+
+    def __init__(self, path: str, symbols: Iterable[str], interval_seconds: float = 60,
+                 sma_windows: Iterable[int] = (), capacity: int = 500):
+        self.reader = CsvTailReader(path)
+        self.bars = {symbol.upper(): BarBuilder(interval_seconds, sma_windows, capacity) for symbol in symbols}
+        self.latest: dict[str, SymbolQuote] = {}
+
+    def update(self) -> int:
+        """Apply the rows appended since the previous call; returns how many were applied."""
+        applied = 0
+        for row in self.reader.read_rows():
+            parsed = parse_wide_row(row)
+            if parsed is None:
+                continue
+            time, quotes = parsed
+            for symbol, quote in quotes.items():
+                builder = self.bars.get(symbol)
+                if builder is None:
+                    continue
+                previous = self.latest.get(symbol)
+                traded = 0.0
+                if previous is not None and quote.volume > previous.volume:
+                    traded = quote.volume - previous.volume
+                if np.isnan(quote.volume) and previous is not None:
+                    quote = quote._replace(volume=previous.volume)
+                builder.add(time, quote.price, traded)
+                self.latest[symbol] = quote
+            applied += 1
+        return applied
@@ -0,0 +1,145 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+def approximate_size(value: object) -> int:
+    """Rough deep size in bytes of JSON-like values (dicts, lists, tuples, strings, numbers)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(k) + approximate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+class TTLCache:
+    """Thread-safe cache bounded by entry count (and optionally bytes) with per-entry expiry.
+
+    Expired entries are dropped when read and swept before anything live is
+    evicted; when the cache is still full the least recently used entry goes.
+    With ``stale_ttl`` expired entries are kept that much longer so ``lookup``
+    can still serve them, flagged as stale.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_bytes: Optional[int] = None, stale_ttl: float = 0):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        # key -> (expires_at, value, approximate size)
+        self._entries: OrderedDict[Hashable, tuple[float, object, int]] = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: Hashable, default=None):
+        """Return the value for ``key`` only while it is fresh."""
+        found = self.lookup(key, allow_stale=False)
+        return default if found is None else found[0]
+
+    def lookup(self, key: Hashable, allow_stale: bool = True) -> Optional[tuple[object, bool]]:
+        """Return ``(value, is_stale)``, or None when the key is missing or too old to serve."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at = entry[0]
+            if expires_at + self.stale_ttl <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            is_stale = expires_at <= now
+            if is_stale and not allow_stale:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if is_stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return entry[1], is_stale
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Seconds until ``key`` expires (negative once stale), or None if it is not cached.
+
+        Does not count as an access for LRU order or hit/miss counters.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry[0] - time.monotonic()
+
+    def set(self, key: Hashable, value: object, ttl: Optional[float] = None) -> None:
+        now = time.monotonic()
+        size = approximate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (now + (self.ttl if ttl is None else ttl), value, size)
+            self._bytes += size
+            if self._over_capacity():
+                self._evict(now)
+
+    def pop(self, key: Hashable, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: Hashable):
+        _expires_at, value, size = self._entries.pop(key)
+        self._bytes -= size
+        return value
+
+    def _over_capacity(self) -> bool:
+        return len(self._entries) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes)
+
+    def _evict(self, now: float) -> None:
+        # Sweeping is O(n), so do it at most once a second; LRU eviction covers the rest.
+        if now - self._last_sweep >= 1.0:
+            self._last_sweep = now
+            for key in [key for key, entry in self._entries.items() if entry[0] + self.stale_ttl <= now]:
+                self._remove(key)
+                self.expirations += 1
+        while self._over_capacity() and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
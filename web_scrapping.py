@@ -4,11 +4,15 @@ from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 
+import http_client
+from shared_cache import get_shared_cache
+from ttl_cache import TTLCache
+
 REQUEST_TIMEOUT = 10
 HEADERS = {"User-Agent": "STOCKIE/1.0"}
 FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
 FINNHUB_CACHE_SECONDS = 300
-finnhub_cache: dict[tuple[str, str], tuple[float, object]] = {}
+finnhub_cache = TTLCache(maxsize=int(os.environ.get("FINNHUB_CACHE_MAX_ENTRIES", "2000")), ttl=FINNHUB_CACHE_SECONDS)
 
 
 def load_local_finnhub_config() -> None:
@@ -33,12 +37,19 @@ def _finnhub_get(endpoint: str, ticker: str, **params):
         raise RuntimeError("Finnhub is not configured")
 
     cache_key = (endpoint, ticker)
-    now = dt.datetime.now().timestamp()
     cached = finnhub_cache.get(cache_key)
-    if cached and cached[0] > now:
-        return cached[1]
-
-    response = requests.get(
+    if cached is not None:
+        return cached
+
+    # Another worker may already have fetched this within the TTL.
+    shared_key = f"finnhub:{endpoint}:{ticker}"
+    shared = get_shared_cache().get(shared_key)
+    if shared is not None:
+        payload, ttl_left = shared
+        finnhub_cache.set(cache_key, payload, ttl=ttl_left)
+        return payload
+
+    response = http_client.get(
         f"{FINNHUB_BASE_URL}/{endpoint}",
         params={"symbol": ticker, "token": FINNHUB_API_KEY, **params},
         timeout=REQUEST_TIMEOUT,
@@ -47,7 +58,8 @@ def _finnhub_get(endpoint: str, ticker: str, **params):
     payload = response.json()
     if isinstance(payload, dict) and payload.get("error"):
         raise RuntimeError("Finnhub returned an error")
-    finnhub_cache[cache_key] = (now + FINNHUB_CACHE_SECONDS, payload)
+    finnhub_cache.set(cache_key, payload)
+    get_shared_cache().set(shared_key, payload, FINNHUB_CACHE_SECONDS)
     return payload
 
 
@@ -122,7 +134,7 @@ def summary(stock_code):
 
     url = f'https://finance.yahoo.com/quote/{stock_code}'
     try:
-        response = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+        response = http_client.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -174,7 +186,7 @@ def event(stock_code):
 
     url = f"https://finance.yahoo.com/quote/{stock_code}"
     try:
-        r = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+        r = http_client.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
         r.raise_for_status()
         soup = BeautifulSoup(r.text, 'html.parser')
 
@@ -219,7 +231,7 @@ def data(ticker):
         pass
 
     url = f'https://query1.finance.yahoo.com/v1/finance/search?q={ticker}'
-    response = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    response = http_client.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     payload = response.json()
 
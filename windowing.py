@@ -0,0 +1,86 @@
+"""Sliding windows over price series, shared by training (k.py) and inference.
+
+A series is a ``(n,)`` or ``(n, features)`` array; windows are ``(count, window, features)``,
+the input shape of the LSTM models. ``sliding_windows`` returns a strided view, so building
+the training set copies nothing until the model reads it.
+"""
+from typing import Iterable, Iterator
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _as_2d(series) -> np.ndarray:
+    series = np.asarray(series)
+    return series.reshape(-1, 1) if series.ndim == 1 else series
+
+
+def sliding_windows(series, window: int, step: int = 1) -> np.ndarray:
+    """Every ``window``-long run of consecutive rows, as a read-only ``(count, window, features)`` view."""
+    series = _as_2d(series)
+    if len(series) < window:
+        raise ValueError(f"Not enough data. Need at least {window} rows.")
+    # sliding_window_view puts the window axis last: (count, features, window).
+    return sliding_window_view(series, window, axis=0)[::step].transpose(0, 2, 1)
+
+
+def training_pairs(series, window: int, target_column: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Windows and the value that follows each one: ``x[i] = series[i:i+window]``, ``y[i] = series[i+window]``."""
+    series = _as_2d(series)
+    if len(series) <= window:
+        raise ValueError(f"Not enough data. Need more than {window} rows.")
+    return sliding_windows(series[:-1], window), series[window:, target_column]
+
+
+def last_window(series, window: int) -> np.ndarray:
+    """The most recent window as a ``(1, window, features)`` model input."""
+    return sliding_windows(_as_2d(series)[-window:], window)
+
+
+def iter_training_batches(
+    chunks: Iterable[np.ndarray], window: int, batch_size: int = 256, target_column: int = 0
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Stream ``(x, y)`` batches from a series delivered in consecutive chunks.
+
+    Only the current chunk plus ``window`` carried-over rows are held in memory, so the
+    full history can be larger than RAM (for example chunks read from a memory-mapped table).
+    """
+    carry = rest_x = rest_y = None
+    for chunk in chunks:
+        chunk = _as_2d(chunk)
+        series = chunk if carry is None else np.concatenate([carry, chunk])
+        carry = series[-window:]
+        if len(series) <= window:
+            continue
+        x, y = training_pairs(series, window, target_column)
+        start = 0
+        if rest_y is not None:
+            # Top up the partial batch left over from the previous chunk.
+            start = min(batch_size - len(rest_y), len(y))
+            rest_x, rest_y = np.concatenate([rest_x, x[:start]]), np.concatenate([rest_y, y[:start]])
+            if len(rest_y) < batch_size:
+                continue
+            yield rest_x, rest_y
+        while start + batch_size <= len(y):
+            yield x[start: start + batch_size], y[start: start + batch_size]
+            start += batch_size
+        rest_x, rest_y = x[start:], y[start:]
+    if rest_y is not None and len(rest_y):
+        yield rest_x, rest_y
+
+
+def training_dataset(chunk_source, window: int, features: int = 1, batch_size: int = 256, target_column: int = 0):
+    """``tf.data.Dataset`` of ``(x, y)`` batches; ``chunk_source()`` must return a fresh chunk iterable per epoch."""
+    import tensorflow as tf
+
+    def batches():
+        for x, y in iter_training_batches(chunk_source(), window, batch_size, target_column):
+            yield x.astype(np.float32), y.astype(np.float32)
+
+    return tf.data.Dataset.from_generator(
+        batches,
+        output_signature=(
+            tf.TensorSpec(shape=(None, window, features), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ),
+    ).prefetch(tf.data.AUTOTUNE)